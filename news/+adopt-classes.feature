@@ -0,0 +1,2 @@
+``api.env.adopt_user`` and ``api.env.adopt_roles`` restore the previous user and roles when the block raises an exception.
+They return light-weight objects that can be entered again, also nested, and can decorate functions.
@@ -0,0 +1 @@
+Add micro-benchmarks for all public functions in ``plone.api.tests.benchmarks``, with JSON output and comparison against a stored baseline.
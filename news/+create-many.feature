@@ -0,0 +1,2 @@
+Add ``api.content.create_many`` to create many content items at once, without renaming each item after it was added.
+Items of types that are not Dexterity types are created with api.content.create.
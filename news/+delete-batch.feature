@@ -0,0 +1 @@
+``api.content.delete`` now deletes all objects in the same container with one ``manage_delObjects`` call and unindexes them in one batch.
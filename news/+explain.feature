@@ -0,0 +1,2 @@
+Add ``api.content.explain`` to show the normalized query and the indexes of a search ordered by their estimated selectivity.
+``api.content.find`` no longer searches the catalog when an index of the query cannot match anything.
@@ -0,0 +1,2 @@
+Add ``api.content.find_breaches`` to find link integrity breaches batch by batch in the relation catalog.
+``api.content.delete`` uses it instead of the ``delete_confirmation_info`` view.
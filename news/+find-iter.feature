@@ -0,0 +1 @@
+Add ``api.content.find_iter`` to iterate over search results in batches, optionally getting the objects and deactivating the objects of each batch once the next batch is loaded.
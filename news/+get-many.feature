@@ -0,0 +1 @@
+Add ``api.content.get_many`` to get many objects by UID or path with a single catalog query.
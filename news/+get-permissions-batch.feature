@@ -0,0 +1,3 @@
+``api.user.get_permissions`` looks up the roles of all permissions in one pass and asks the user only once per distinct set of roles.
+A new ``permissions`` parameter limits the check to the given permissions.
+[agent]
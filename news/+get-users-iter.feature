@@ -0,0 +1 @@
+Add ``api.user.get_users_iter`` to iterate over the users of the site or a group, page by page and filtered by properties, looking up each user only when it is reached.
@@ -0,0 +1,2 @@
+``api.content.get_view`` looks up the requested view directly and only lists the available views when it is not found.
+While ``api.portal.enable_lookup_cache`` is enabled, view lookups are cached.
@@ -0,0 +1,2 @@
+``import plone.api`` no longer imports all of its modules on Python 3.7 and later, they are imported on first use.
+``pkg_resources`` is replaced by ``importlib.metadata``, and the checks for ``plone.app.iterate`` and ``Products.PrintingMailHost`` are done on first use.
@@ -0,0 +1 @@
+Add ``api.portal.enable_lookup_cache`` to cache the portal object and tools for the rest of the transaction.
@@ -0,0 +1 @@
+Add ``api.content.move_many`` and ``api.content.copy_many`` to move or copy many objects to a container at once, giving each its final id right away.
@@ -0,0 +1,6 @@
+Add ``api.content.enable_path_cache`` to cache the objects that ``api.content.get`` finds by path for the rest of the transaction.
+``plone.api`` now registers a ``z3c.autoinclude.plugin`` entry point, so Plone loads its ZCML automatically.
+That ZCML registers the event subscribers that clear the cache when content is moved, deleted or changes its workflow state, and when local roles are changed in the sharing view.
+Local role changes made with ``plone.api`` clear the cache too.
+The entry point changes the ZCML loaded by every site that installs ``plone.api``, but the ZCML only registers these subscribers.
+Without the ZCML, ``enable_path_cache`` warns and leaves the cache off.
@@ -0,0 +1,2 @@
+Add ``api.user.get_permission_matrix`` to check the permissions of many users on many objects in one call.
+The result is a ``PermissionMatrix`` that stores one bit per user, object and permission.
@@ -0,0 +1 @@
+``api.env.read_only_mode`` no longer opens a new ZODB connection, but asks the connection of the current site.
@@ -0,0 +1,2 @@
+Add ``api.portal.get_registry_records`` to get many registry records, or all settings of an interface, as a dictionary.
+While ``api.portal.enable_lookup_cache`` is enabled, registry records are read once until they change.
@@ -0,0 +1,2 @@
+``api.portal.get_registry_record`` finds the records it suggests for a missing record in an index of the record names, instead of scanning all records.
+Pass ``suggest=False`` to leave out the suggestions.
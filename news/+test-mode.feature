@@ -0,0 +1,2 @@
+Add ``api.env.set_test_mode`` for test layers to switch on test mode.
+``api.env.test_mode`` no longer inspects the call stack, but falls back to the ``PLONE_API_TEST_MODE`` environment variable and whether the zope test runner is loaded.
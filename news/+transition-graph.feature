@@ -0,0 +1,2 @@
+``api.content.transition`` with ``to_state`` caches the transition graph of each workflow and finds the shortest path breadth first, instead of rebuilding the graph and searching all paths for every object.
+The cached graph is compared with the saved workflow definition once per transaction, and unsaved changes to a definition are picked up right away.
@@ -0,0 +1 @@
+Add ``api.content.transition_many`` to transition many objects at once, reporting failures per object and updating the catalog once at the end.
@@ -0,0 +1 @@
+Add ``api.env.enable_user_cache``, ``api.env.disable_user_cache`` and ``api.env.invalidate_user_cache`` to look up the users adopted by ``api.env.adopt_user``, ``api.user.has_permission`` and ``api.user.get_permissions`` only once within a time to live.
@@ -0,0 +1,3 @@
+Fuse all validators stacked on a function into a single wrapper that is generated at decoration time.
+Validating a call now costs close to nothing, error messages are unchanged.
+The ``decorator`` dependency is no longer needed.
@@ -0,0 +1,2 @@
+``api.env.plone_version`` and ``api.env.zope_version`` are now looked up once per process.
+They return a string that orders as a version number, with a ``release`` tuple of its numbers.
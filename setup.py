@@ -32,7 +32,7 @@ setup(
     keywords='plone api',
     install_requires=[
         'Products.statusmessages',
-        'decorator',
+        'importlib-metadata; python_version<"3.8"',
         'plone.app.uuid',
         'plone.app.linkintegrity',
         'plone.uuid',
@@ -67,4 +67,8 @@ setup(
         'Programming Language :: Python :: 3.9',
     ],
     platforms='Any',
+    entry_points='''
+    [z3c.autoinclude.plugin]
+    target = plone
+    ''',
 )
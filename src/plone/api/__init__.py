@@ -1,8 +1,40 @@
-# flake8: NOQA: S401
-
-from plone.api import content
-from plone.api import env
-from plone.api import group
-from plone.api import portal
-from plone.api import relation
-from plone.api import user
+"""The plone.api modules are imported on first use, not with plone.api.
+
+Python 3.6 does not support ``__getattr__`` on modules (PEP 562), so there
+the modules are imported with plone.api, as before.
+"""
+
+import importlib
+import sys
+
+
+__all__ = (
+    'content',
+    'env',
+    'exc',
+    'group',
+    'portal',
+    'relation',
+    'user',
+    'validation',
+)
+
+
+def __getattr__(name):
+    if name in __all__:
+        # The import sets the module as attribute of this package, so this
+        # only runs once per module.
+        return importlib.import_module('plone.api.' + name)
+    raise AttributeError(
+        "module 'plone.api' has no attribute '{}'".format(name),
+    )
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
+
+
+if sys.version_info < (3, 7):  # pragma: no cover
+    for name in __all__:
+        importlib.import_module('plone.api.' + name)
+    del name
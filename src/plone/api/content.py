@@ -1,29 +1,61 @@
 """Module that provides functionality for content manipulation."""
 
-from copy import copy as _copy
-from pkg_resources import DistributionNotFound
-from pkg_resources import get_distribution
-from pkg_resources import parse_version
+from AccessControl import Unauthorized
+from AccessControl.SecurityManagement import getSecurityManager
+from Acquisition import aq_base
+from Acquisition import aq_inner
+from Acquisition import aq_parent
+from collections import deque
+from collections import OrderedDict
+from OFS.CopySupport import CopyError
+from OFS.CopySupport import sanity_check
+from OFS.event import ObjectClonedEvent
+from OFS.event import ObjectWillBeMovedEvent
+from OFS.subscribers import compatibilityCall
 from plone.api import portal
 from plone.api.exc import InvalidParameterError
+from plone.api.exc import MissingParameterError
 from plone.api.validation import at_least_one_of
 from plone.api.validation import mutually_exclusive_parameters
 from plone.api.validation import required_parameters
 from plone.app.linkintegrity.exceptions import LinkIntegrityNotificationException  # noqa
 from plone.app.uuid.utils import uuidToObject
+from plone.dexterity.interfaces import IDexterityFTI
+from plone.dexterity.utils import createContent
 from plone.uuid.interfaces import IUUID
+from Products.CMFCore.indexing import processQueue
 from Products.CMFCore.WorkflowCore import WorkflowException
-from zope.component import getMultiAdapter
+from Products.CMFPlone.utils import base_hasattr
+from Products.ZCatalog.Lazy import LazyCat
+from zc.relation.catalog import any as any_of
+from zc.relation.interfaces import ICatalog
+from zExceptions import ResourceLockedError
+from zope.component import getGlobalSiteManager
 from zope.component import getSiteManager
+from zope.component import getUtility
+from zope.component import queryUtility
+from zope.container.contained import notifyContainerModified
 from zope.container.interfaces import INameChooser
+from zope.event import notify
+from zope.globalrequest import getRequest
+from zope.i18n import translate
 from zope.interface import Interface
 from zope.interface import providedBy
+from zope.intid.interfaces import IIntIds
+from zope.lifecycleevent import ObjectCopiedEvent
+from zope.lifecycleevent import ObjectMovedEvent
 
 import random
 import transaction
+import warnings
 
 _marker = []
 
+# Id of the local workflow policy configuration of
+# Products.CMFPlacefulWorkflow, which changes the workflow chain of the
+# folder it is in.
+_POLICY_CONFIG = '.wf_policy_config'
+
 
 @required_parameters('container', 'type')
 @at_least_one_of('id', 'title')
@@ -105,6 +137,132 @@ def create(
     return content
 
 
+def _allowed_types(container, type):
+    """Return the ids of the types that can be added to the container.
+
+    Raise an InvalidParameterError if ``type`` is not one of them.
+    """
+    types = [fti.getId() for fti in container.allowedContentTypes()]
+    if type not in types:
+        raise InvalidParameterError(
+            "Cannot add a '{obj_type}' object to the container.\n"
+            'Allowed types are:\n'
+            '{allowed_types}\n'.format(
+                obj_type=type,
+                allowed_types='\n'.join(sorted(types)),
+            ),
+        )
+    return types
+
+
+@required_parameters('items')
+def create_many(container=None, items=None, safe_id=False, batch_size=100):
+    """Create many content items at once.
+
+    Unlike :meth:`create`, the final id of each item is chosen before it is
+    added to its container, so there is no renaming afterwards. Catalog
+    indexing is processed once per batch. Items of types that are not
+    Dexterity types are created with :meth:`create`.
+
+    :param container: Container object in which to create the new objects,
+        unless an item specifies its own ``container``.
+    :type container: Folderish content object
+    :param items: [required] The items to create. Each item is a dictionary
+        with the arguments of :meth:`create`: ``type`` is required, as is
+        one of ``id`` and ``title``. ``container`` and ``safe_id`` are
+        optional, all other keys are set on the new object.
+    :type items: iterable of dictionaries
+    :param safe_id: Default for the ``safe_id`` of the items. When False, the
+        given id will be enforced. When True, choose a new, non-conflicting
+        id.
+    :type safe_id: boolean
+    :param batch_size: Process the catalog indexing queue and make a
+        savepoint after this many items, to keep memory usage bounded.
+        Use ``None`` to never do so.
+    :type batch_size: int
+    :returns: Content objects, in the order of ``items``
+    :rtype: list
+    :raises:
+        KeyError,
+        :class:`~plone.api.exc.MissingParameterError`,
+        :class:`~plone.api.exc.InvalidParameterError`
+    :Example: :ref:`content-create-many-example`
+    """
+    created = []
+    # Allowed types and name choosers, per container
+    allowed_types = {}
+    choosers = {}
+    # Whether each type is a Dexterity type
+    dexterity_types = {}
+
+    for item in items:
+        kwargs = dict(item)
+        item_container = kwargs.pop('container', container)
+        type = kwargs.pop('type', None)
+        id = kwargs.pop('id', None)
+        item_safe_id = kwargs.pop('safe_id', safe_id)
+        title = kwargs.get('title')
+
+        missing = [
+            name
+            for name, value in (('container', item_container), ('type', type))
+            if value is None
+        ]
+        if missing:
+            raise MissingParameterError(
+                'Missing required parameter(s): {params}'.format(
+                    params=', '.join(missing),
+                ),
+            )
+        if not id and not title:
+            raise MissingParameterError(
+                'At least one of these parameters must be '
+                'supplied: id, title.',
+            )
+
+        key = item_container.getPhysicalPath()
+        if type not in allowed_types.setdefault(key, ()):
+            allowed_types[key] = _allowed_types(item_container, type)
+
+        if type not in dexterity_types:
+            fti = portal.get_tool('portal_types').getTypeInfo(type)
+            dexterity_types[type] = IDexterityFTI.providedBy(fti)
+
+        if not title:
+            kwargs.pop('title', None)
+        if not dexterity_types[type]:
+            # Only Dexterity content can be created outside of its
+            # container, other types are added by their factory.
+            kwargs.pop('title', None)
+            obj = create(
+                container=item_container,
+                type=type,
+                id=id,
+                title=title,
+                safe_id=item_safe_id,
+                **kwargs,
+            )
+            created.append(obj)
+        else:
+            content = createContent(type, **kwargs)
+            if id and not item_safe_id:
+                new_id = id
+            else:
+                if key not in choosers:
+                    choosers[key] = INameChooser(item_container)
+                new_id = choosers[key].chooseName(id or title, content)
+            content.id = new_id
+            new_id = item_container._setObject(new_id, content)
+            created.append(item_container._getOb(new_id))
+
+        if batch_size and not len(created) % batch_size:
+            processQueue()
+            transaction.savepoint(optimistic=True)
+
+    processQueue()
+    return created
+
+
 @mutually_exclusive_parameters('path', 'UID')
 @at_least_one_of('path', 'UID')
 def get(path=None, UID=None):
@@ -122,12 +280,11 @@ def get(path=None, UID=None):
     """
     if path:
         site = portal.get()
-        site_absolute_path = '/'.join(site.getPhysicalPath())
-        if not path.startswith('{path}'.format(path=site_absolute_path)):
-            path = '{site_path}{relative_path}'.format(
-                site_path=site_absolute_path,
-                relative_path=path,
-            )
+        path = _absolute_path(site, path)
+
+        path_cache = _get_path_cache()
+        if path_cache is not None:
+            return path_cache.traverse(site, path)
 
         try:
             return site.restrictedTraverse(path)
@@ -138,6 +295,208 @@ def get(path=None, UID=None):
         return uuidToObject(UID)
 
 
+class _PathCache:
+    """Least recently used cache of objects traversed to by path.
+
+    The objects are cached per security context, because what the current
+    user can traverse to depends on it.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self.contexts = {}
+
+    def traverse(self, site, path):
+        # A new security context is set up for every user switch, and the
+        # roles overriding it are pushed on its stack. The context and the
+        # stack are kept alive as long as the cache, so their ids can't be
+        # reused by other objects.
+        context = getSecurityManager()._context
+        stack = tuple(context.stack)
+        key = (id(context), ) + tuple(id(item) for item in stack)
+        entry = self.contexts.get(key)
+        if entry is None:
+            entry = self.contexts[key] = (context, stack, OrderedDict())
+        objects = entry[2]
+
+        if path in objects:
+            objects.move_to_end(path)
+            return objects[path]
+
+        try:
+            obj = site.restrictedTraverse(path)
+        except (KeyError, AttributeError):
+            obj = None  # When no object is found don't raise an error
+
+        objects[path] = obj
+        if len(objects) > self.maxsize:
+            objects.popitem(last=False)
+        return obj
+
+    def clear(self):
+        self.contexts.clear()
+
+
+def _get_path_cache():
+    """Return the path cache of the current transaction, if enabled."""
+    cache = portal._get_lookup_cache()
+    if cache is None:
+        return None
+    return cache.get(_PathCache)
+
+
+def enable_path_cache(maxsize=1000):
+    """Cache the objects that :meth:`get` finds by path, for the current
+    transaction.
+
+    Objects are cached per user and roles, and the cache is cleared when
+    content is added, moved, renamed or deleted, or changes its workflow
+    state, and when local roles are changed with plone.api or the sharing
+    view. This also enables :meth:`plone.api.portal.enable_lookup_cache`.
+
+    :param maxsize: Number of paths to cache per user. The least recently
+        used paths are dropped first.
+    :type maxsize: int
+    :Example: :ref:`content-enable-path-cache-example`
+    """
+    if not _path_cache_subscribers_registered():
+        warnings.warn(
+            'The path cache is not enabled, because the ZCML of plone.api '
+            'that keeps it up to date is not loaded.',
+            RuntimeWarning,
+            stacklevel=2,
+        )
+        return
+
+    portal.enable_lookup_cache()
+    cache = portal._get_lookup_cache()
+    path_cache = cache.get(_PathCache)
+    if path_cache is None:
+        cache[_PathCache] = _PathCache(maxsize)
+    else:
+        path_cache.maxsize = maxsize
+
+
+# Set once the subscribers of configure.zcml have been found.
+_path_cache_subscribers = False
+
+
+def _path_cache_subscribers_registered():
+    """Check that the subscribers that clear the path cache are registered.
+
+    Without them, :meth:`get` would return moved and deleted objects.
+    """
+    global _path_cache_subscribers
+    if not _path_cache_subscribers:
+        _path_cache_subscribers = any(
+            registration.handler is _invalidate_path_cache
+            for registration in getGlobalSiteManager().registeredHandlers()
+        )
+    return _path_cache_subscribers
+
+
+def disable_path_cache():
+    """Drop the cache set up by :meth:`enable_path_cache`.
+
+    :Example: :ref:`content-enable-path-cache-example`
+    """
+    cache = portal._get_lookup_cache()
+    if cache is not None:
+        cache.pop(_PathCache, None)
+
+
+def _clear_path_cache():
+    """Clear the path cache, if enabled, after local roles changed."""
+    path_cache = _get_path_cache()
+    if path_cache is not None:
+        path_cache.clear()
+
+
+def _invalidate_path_cache(obj, event):
+    """Clear the path cache when content is moved or its security changes."""
+    _clear_path_cache()
+
+
+def _site_path(site):
+    """Return the path of the site, as a string."""
+    cache = portal._get_lookup_cache()
+    if cache is None:
+        return '/'.join(site.getPhysicalPath())
+
+    key = (_site_path, site.getId())
+    site_path = cache.get(key)
+    if site_path is None:
+        site_path = cache[key] = '/'.join(site.getPhysicalPath())
+    return site_path
+
+
+def _absolute_path(site, path):
+    """Prefix a path relative to the portal root with the portal path."""
+    site_absolute_path = _site_path(site)
+    if not path.startswith('{path}'.format(path=site_absolute_path)):
+        path = '{site_path}{relative_path}'.format(
+            site_path=site_absolute_path,
+            relative_path=path,
+        )
+    return path
+
+
+@mutually_exclusive_parameters('paths', 'UIDs')
+@at_least_one_of('paths', 'UIDs')
+def get_many(paths=None, UIDs=None):
+    """Get many objects at once.
+
+    All objects are looked up with a single catalog query.
+
+    :param paths: Paths to the objects we want to get, relative to
+        the portal root.
+    :type paths: list of strings
+    :param UIDs: UIDs of the objects we want to get.
+    :type UIDs: list of strings
+    :returns: The content objects, keyed by the given paths or UIDs, in the
+        order they were given. Objects that cannot be found or that the
+        current user is not allowed to access are None.
+    :rtype: OrderedDict
+    :Example: :ref:`content-get-many-example`
+    """
+    site = portal.get()
+    catalog = portal.get_tool('portal_catalog')
+
+    if UIDs is not None:
+        keys = list(UIDs)
+        brains = catalog.unrestrictedSearchResults(UID=keys)
+        found = {brain.UID: brain for brain in brains}
+    else:
+        keys = list(paths)
+        absolute_paths = [_absolute_path(site, path) for path in keys]
+        brains = catalog.unrestrictedSearchResults(
+            path={'query': absolute_paths, 'depth': 0},
+        )
+        by_path = {brain.getPath(): brain for brain in brains}
+        found = {
+            path: by_path.get(absolute_path)
+            for path, absolute_path in zip(keys, absolute_paths)
+        }
+
+    result = OrderedDict()
+    for key in keys:
+        brain = found.get(key)
+        obj = None
+        if brain is not None:
+            try:
+                obj = brain.getObject()
+            except (KeyError, AttributeError, Unauthorized):
+                pass
+        elif paths is not None:
+            # Not everything that can be traversed to is cataloged.
+            try:
+                obj = site.restrictedTraverse(_absolute_path(site, key))
+            except (KeyError, AttributeError, Unauthorized):
+                pass
+        result[key] = obj
+    return result
+
+
 @required_parameters('source')
 @at_least_one_of('target', 'id')
 def move(source=None, target=None, id=None, safe_id=False):
@@ -254,6 +613,190 @@ def copy(source=None, target=None, id=None, safe_id=False):
         return target[new_id]
 
 
+@required_parameters('sources', 'target')
+def move_many(sources=None, target=None, ids=None, safe_id=False):
+    """Move many objects to the target container at once.
+
+    Unlike calling :meth:`move` for every object, each object is moved
+    straight to its final id, without renaming it afterwards. The source
+    containers and the target are marked as modified once, and the moved
+    objects are reindexed together at the end.
+
+    :param sources: [required] Objects that we want to move. None of them
+        may be inside another one.
+    :type sources: List of content objects
+    :param target: [required] Target container to which the objects will be
+        moved.
+    :type target: Folderish content object
+    :param ids: Ids of the moved objects in the target container, in the
+        order of ``sources``. ``None`` keeps the id of that object; if it
+        conflicts with another object in the target container, a prefix is
+        added to it.
+    :type ids: List of strings
+    :param safe_id: When False, the given ids will be enforced. If an id is
+        conflicting with another object in the target container, raise a
+        InvalidParameterError. When True, choose a new, non-conflicting id.
+    :type safe_id: boolean
+    :returns: Content objects in the target location, in the order of
+        ``sources``
+    :rtype: list
+    :raises:
+        :class:`~plone.api.exc.MissingParameterError`,
+        :class:`~plone.api.exc.InvalidParameterError`
+    :Example: :ref:`content-move-many-example`
+    """
+    paths = {source.getPhysicalPath() for source in sources}
+    for path in paths:
+        if any(path[:length] in paths for length in range(1, len(path))):
+            raise InvalidParameterError(
+                'Cannot move {} together with a container of it.'.format(
+                    '/'.join(path),
+                ),
+            )
+    return _paste_many(sources, target, ids, safe_id, _move)
+
+
+@required_parameters('sources', 'target')
+def copy_many(sources=None, target=None, ids=None, safe_id=False):
+    """Copy many objects to the target container at once.
+
+    Unlike calling :meth:`copy` for every object, each copy gets its final
+    id right away, without renaming it afterwards. The copies are indexed
+    together at the end.
+
+    :param sources: [required] Objects that we want to copy.
+    :type sources: List of content objects
+    :param target: [required] Target container to which the objects will be
+        copied.
+    :type target: Folderish content object
+    :param ids: Ids of the copies in the target container, in the order of
+        ``sources``. ``None`` keeps the id of that object; if it conflicts
+        with another object in the target container, a prefix is added
+        to it.
+    :type ids: List of strings
+    :param safe_id: When False, the given ids will be enforced. If an id is
+        conflicting with another object in the target container, raise a
+        InvalidParameterError. When True, choose a new, non-conflicting id.
+    :type safe_id: boolean
+    :returns: Content objects that were created in the target location, in
+        the order of ``sources``
+    :rtype: list
+    :raises:
+        :class:`~plone.api.exc.MissingParameterError`,
+        :class:`~plone.api.exc.InvalidParameterError`
+    :Example: :ref:`content-copy-many-example`
+    """
+    return _paste_many(sources, target, ids, safe_id, _copy)
+
+
+def _paste_many(sources, target, ids, safe_id, paste):
+    """Paste ``sources`` into ``target`` with ``paste``, :func:`_move` or
+    :func:`_copy`.
+    """
+    sources = list(sources)
+    if ids is None:
+        ids = [None] * len(sources)
+    elif len(ids) != len(sources):
+        raise InvalidParameterError(
+            'Got {} ids for {} sources.'.format(len(ids), len(sources)),
+        )
+
+    chooser = None
+    pasted = []
+    # Source containers, to mark as modified once
+    containers = OrderedDict()
+    for source, id in zip(sources, ids):
+        container = aq_parent(aq_inner(source))
+        if id is None:
+            if aq_base(container) is aq_base(target) and paste is _move:
+                id = source.getId()
+            else:
+                id = target._get_id(source.getId())
+        elif id in target and (
+            paste is not _move or aq_base(target[id]) is not aq_base(source)
+        ):
+            if not safe_id:
+                msg = "Duplicate ID '{0}' in '{1}' for '{2}'"
+                raise InvalidParameterError(msg.format(id, target, source))
+            if chooser is None:
+                chooser = INameChooser(target)
+            id = chooser.chooseName(id, source)
+
+        if paste is _move and aq_base(container) is aq_base(target) and (
+            id == source.getId()
+        ):
+            # Nothing to do
+            pasted.append(source)
+            continue
+        pasted.append(paste(source, target, id))
+        containers.setdefault(container.getPhysicalPath(), container)
+
+    if paste is _move:
+        for container in containers.values():
+            notifyContainerModified(container)
+        if target.getPhysicalPath() not in containers and containers:
+            notifyContainerModified(target)
+    processQueue()
+    return pasted
+
+
+def _move(ob, target, id):
+    """Move ``ob`` into ``target`` as ``id``.
+
+    This is what pasting a cut object does in OFS.CopySupport, except
+    that the new id is given and the containers are not notified.
+    """
+    if ob.wl_isLocked():
+        raise ResourceLockedError(
+            'Object "{}" is locked'.format(ob.getId()),
+        )
+    if not ob.cb_isMoveable():
+        raise CopyError('Not supported {}'.format(ob.getId()))
+    target._verifyObjectPaste(ob, validate_src=2)
+    ob._notifyOfCopyTo(target, op=1)
+    if not sanity_check(target, ob):
+        raise CopyError('This object cannot be pasted into itself')
+
+    container = aq_parent(aq_inner(ob))
+    orig_id = ob.getId()
+    notify(ObjectWillBeMovedEvent(ob, container, orig_id, target, id))
+    # Make ownership explicit, so that it is carried along.
+    ob.manage_changeOwnershipType(explicit=1)
+    container._delObject(orig_id, suppress_events=True)
+    ob = aq_base(ob)
+    ob._setId(id)
+    target._setObject(id, ob, set_owner=0, suppress_events=True)
+    ob = target._getOb(id)
+    notify(ObjectMovedEvent(ob, container, orig_id, target, id))
+    ob._postCopy(target, op=1)
+    ob.manage_changeOwnershipType(explicit=0)
+    return ob
+
+
+def _copy(ob, target, id):
+    """Copy ``ob`` into ``target`` as ``id``.
+
+    This is what pasting a copied object does in OFS.CopySupport, except
+    that the new id is given.
+    """
+    if not ob.cb_isCopyable():
+        raise CopyError('Not supported {}'.format(ob.getId()))
+    target._verifyObjectPaste(ob, validate_src=1)
+    ob._notifyOfCopyTo(target, op=0)
+
+    orig_ob = ob
+    ob = ob._getCopy(target)
+    ob._setId(id)
+    notify(ObjectCopiedEvent(ob, orig_ob))
+    target._setObject(id, ob)
+    ob = target._getOb(id)
+    ob.wl_clearLocks()
+    ob._postCopy(target, op=0)
+    compatibilityCall('manage_afterClone', ob, ob)
+    notify(ObjectClonedEvent(ob))
+    return ob
+
+
 @mutually_exclusive_parameters('obj', 'objects')
 @at_least_one_of('obj', 'objects')
 def delete(obj=None, objects=None, check_linkintegrity=True):
@@ -261,7 +804,8 @@ def delete(obj=None, objects=None, check_linkintegrity=True):
 
     :param obj: Object that we want to delete.
     :type obj: Content object
-    :param objects: Objects that we want to delete.
+    :param objects: Objects that we want to delete. Objects in the same
+        container are deleted together.
     :type objects: List of content objects
     :param check_linkintegrity: Raise exception if there are
         linkintegrity-breaches.
@@ -280,21 +824,167 @@ def delete(obj=None, objects=None, check_linkintegrity=True):
         return
 
     if check_linkintegrity:
-        site = portal.get()
-        linkintegrity_view = get_view(
-            name='delete_confirmation_info',
-            context=site,
-            request=site.REQUEST,
-        )
         # look for breaches and manually raise a exception
-        breaches = linkintegrity_view.get_breaches(objects)
+        breaches = list(find_breaches(objects=objects))
         if breaches:
             raise LinkIntegrityNotificationException(
                 'Linkintegrity-breaches: {}'.format(breaches),
             )
 
-    for obj_ in objects:
-        obj_.aq_parent.manage_delObjects([obj_.getId()])
+    for container, ids in _group_by_container(objects):
+        container.manage_delObjects(ids)
+    # Unindex everything that was removed in one go.
+    processQueue()
+
+
+def _group_by_container(objects):
+    """Group ``objects`` by their container.
+
+    Duplicates and objects inside another object of ``objects`` are
+    dropped, as they are removed together with that object anyway.
+
+    :returns: (container, ids) tuples in the order the containers
+        first appear in ``objects``.
+    """
+    paths = {obj.getPhysicalPath() for obj in objects}
+    groups = OrderedDict()
+    for obj in objects:
+        path = obj.getPhysicalPath()
+        if any(path[:length] in paths for length in range(1, len(path))):
+            continue
+        container = aq_parent(aq_inner(obj))
+        ids = groups.setdefault(path[:-1], (container, OrderedDict()))[1]
+        ids[path[-1]] = None
+    return [(container, list(ids)) for container, ids in groups.values()]
+
+
+@required_parameters('objects')
+def find_breaches(objects=None, batch_size=100):
+    """Find the link integrity breaches that deleting objects would cause.
+
+    The relation catalog is queried for the links to ``batch_size`` objects
+    at a time and breaches are yielded as soon as they are found, so you can
+    stop at the first one. Links from objects that would be deleted as well
+    are no breaches.
+
+    :param objects: [required] Objects that would be deleted, together with
+        everything inside them.
+    :type objects: List of content objects
+    :param batch_size: Number of objects to look up links for at once.
+    :type batch_size: int
+    :returns: Breaches, each a dictionary with the ``target`` that is linked
+        to and the ``sources`` that link to it, as the
+        ``delete_confirmation_info`` view of plone.app.linkintegrity
+        describes them. Every object is described by a dictionary with its
+        ``uid``, ``title`` and ``url``. Sources tell whether they are
+        ``accessible`` to the current user, the target has its
+        ``portal_type`` and ``type_title``.
+    :rtype: Iterator of dictionaries
+    :Example: :ref:`content-find-breaches-example`
+    """
+    relation_catalog = queryUtility(ICatalog)
+    if not objects or not relation_catalog:
+        return
+    intids = getUtility(IIntIds)
+    deleted = {obj.getPhysicalPath() for obj in objects}
+
+    targets = OrderedDict()
+    for obj in _contents(objects, deleted):
+        intid = intids.queryId(obj)
+        if intid is None:
+            continue
+        targets[intid] = obj
+        if len(targets) >= batch_size:
+            yield from _find_breaches(relation_catalog, targets, deleted)
+            targets = OrderedDict()
+    if targets:
+        yield from _find_breaches(relation_catalog, targets, deleted)
+
+
+def _contents(objects, paths):
+    """Iterate over ``objects`` and everything inside them, once each.
+
+    ``paths`` are the physical paths of ``objects``.
+    """
+    seen = set()
+    for obj in objects:
+        path = obj.getPhysicalPath()
+        if path not in seen:
+            seen.add(path)
+            yield obj
+
+    processQueue()
+    catalog = portal.get_tool('portal_catalog')
+    brains = catalog.unrestrictedSearchResults(
+        path={'query': ['/'.join(path) for path in paths]},
+    )
+    for brain in brains:
+        if tuple(brain.getPath().split('/')) in paths:
+            continue
+        try:
+            yield brain._unrestrictedGetObject()
+        except (AttributeError, KeyError):
+            # The catalog is out of date
+            continue
+
+
+def _find_breaches(relation_catalog, targets, deleted):
+    """Yield the breaches of links to ``targets``, a dict intid -> object.
+
+    Links from objects inside one of the ``deleted`` paths are ignored.
+    """
+    intids = getUtility(IIntIds)
+    sources = {}
+    # Like plone.app.linkintegrity, every relation counts, not only links
+    # in text: relatedItems and other relation fields, too.
+    relations = relation_catalog.findRelations({'to_id': any_of(*targets)})
+    for relation in relations:
+        if relation.isBroken():
+            continue
+        source = intids.queryObject(relation.from_id)
+        if source is None:
+            continue
+        path = source.getPhysicalPath()
+        if any(path[:length] in deleted for length in range(1, len(path) + 1)):
+            continue
+        sources.setdefault(relation.to_id, []).append(source)
+
+    for intid, target in targets.items():
+        if intid in sources:
+            yield {
+                'target': _describe_target(target),
+                'sources': [
+                    _describe_source(source) for source in sources[intid]
+                ],
+            }
+
+
+# Breaches are described like the delete_confirmation_info view of
+# plone.app.linkintegrity does.
+def _describe_source(obj):
+    return {
+        'uid': IUUID(obj, None),
+        'title': obj.Title(),
+        'url': obj.absolute_url(),
+        'accessible': bool(
+            getSecurityManager().checkPermission('View', obj),
+        ),
+    }
+
+
+def _describe_target(obj):
+    fti = portal.get_tool('portal_types').get(obj.portal_type)
+    if fti is not None:
+        type_title = translate(fti.Title(), context=getRequest())
+    else:
+        type_title = obj.portal_type
+    return {
+        'uid': IUUID(obj, None),
+        'title': obj.Title(),
+        'url': obj.absolute_url(),
+        'portal_type': obj.portal_type,
+        'type_title': type_title,
+    }
 
 
 @required_parameters('obj')
@@ -320,36 +1010,122 @@ def get_state(obj=None, default=_marker):
     return workflow.getInfoFor(ob=obj, name='review_state')
 
 
-# work backwards from our end state
-def _find_path(maps, path, current_state, start_state):
-    paths = []
-    # current_state could not be on maps if it only has outgoing
-    # transitions. i.e an initial state you are not able to return to.
-    if current_state not in maps:
-        return
+# Compiled transition graphs of workflow definitions, see _transition_graph.
+_transition_graphs = {}
 
-    for new_transition, from_states in maps[current_state]:
-        next_path = _copy(path)
-        if new_transition in path:
-            # Don't go in a circle
-            continue
 
-        next_path.insert(0, new_transition)
-        if start_state in from_states:
-            paths.append(next_path)
-            continue
+def _workflow_fingerprint(workflow):
+    """Return the serials of the states and transitions of a workflow.
+
+    :returns: A tuple that changes whenever the definition changes, or None
+        if the definition has unsaved changes and must not be cached.
+    """
+    parts = [workflow.states, workflow.transitions]
+    parts.extend(workflow.states.objectValues())
+    parts.extend(workflow.transitions.objectValues())
+
+    serials = []
+    for part in parts:
+        part = aq_base(part)
+        if getattr(part, '_p_jar', None) is None:
+            return None
+        part._p_activate()
+        if part._p_changed:
+            return None
+        serials.append(part._p_serial)
+    return tuple(serials)
+
+
+def _workflow_changed(workflow):
+    """Tell whether a workflow definition has unsaved changes.
+
+    Reading ``_p_changed`` does not activate ghosts, which have no changes.
+    """
+    for folder in (workflow.states, workflow.transitions):
+        if aq_base(folder)._p_changed:
+            return True
+        for part in folder.objectValues():
+            if aq_base(part)._p_changed:
+                return True
+    return False
+
+
+def _transition_graph(workflow):
+    """Get the transition graph of a workflow definition.
+
+    The graph is cached until the definition changes. The serials of the
+    definition are compared once per transaction; unsaved changes made in
+    the transaction are always picked up.
+
+    :returns: A mapping of each state id to a list of
+        ``(transition id, new state id)`` tuples, and a dictionary to memoize
+        the shortest paths through the graph in.
+    :rtype: tuple
+    """
+    base = aq_base(workflow)
+    jar = getattr(base, '_p_jar', None)
+    txn = transaction.get()
+    cached = None
+    if jar is not None:
+        key = (jar.db().database_name, base._p_oid)
+        cached = _transition_graphs.get(key)
+        if (
+            cached is not None
+            and cached[3] is txn
+            and not _workflow_changed(workflow)
+        ):
+            return cached[1], cached[2]
+
+    fingerprint = _workflow_fingerprint(workflow)
+    if fingerprint is not None:
+        if cached is not None and cached[0] == fingerprint:
+            _transition_graphs[key] = cached[:3] + (txn, )
+            return cached[1], cached[2]
+
+    transitions = {
+        transition.getId(): transition
+        for transition in workflow.transitions.objectValues()
+    }
+    graph = {}
+    for state in workflow.states.objectValues():
+        exits = graph[state.getId()] = []
+        for transition_id in state.getTransitions():
+            transition = transitions.get(transition_id)
+            # Transitions without a new state remain in the current state.
+            if transition is not None and transition.new_state_id:
+                exits.append((transition_id, transition.new_state_id))
+
+    paths = {}
+    if fingerprint is not None:
+        _transition_graphs[key] = (fingerprint, graph, paths, txn)
+    return graph, paths
 
-        for state in from_states:
-            recursive_paths = _find_path(
-                maps,
-                next_path,
-                state,
-                start_state,
-            )
-            if recursive_paths:
-                paths.append(recursive_paths)
 
-    return len(paths) and min(paths, key=len) or None
+def _find_path(graph, start_state, end_state):
+    """Find the shortest path of transitions through the graph, breadth
+    first.
+
+    :returns: Transition ids, or None if ``end_state`` cannot be reached
+    :rtype: tuple
+    """
+    # state id -> (previous state id, transition id) on the shortest path
+    previous = {start_state: None}
+    queue = deque([start_state])
+    while queue:
+        state = queue.popleft()
+        if state == end_state:
+            path = []
+            while previous[state] is not None:
+                state, transition = previous[state]
+                path.append(transition)
+            return tuple(reversed(path))
+
+        for transition, new_state in graph.get(state, ()):
+            if new_state not in previous:
+                previous[new_state] = (state, transition)
+                queue.append(new_state)
+
+    return None
 
 
 def _wf_transitions_for(workflow, from_state, to_state):
@@ -365,34 +1141,24 @@ def _wf_transitions_for(workflow, from_state, to_state):
     :returns: A list of transitions
     :rtype: list
     """
-    exit_state_maps = {}
-    for state in workflow.states.objectValues():
-        for transition in state.getTransitions():
-            exit_state_maps.setdefault(transition, [])
-            exit_state_maps[transition].append(state.getId())
-
-    transition_maps = {}
-    for transition in workflow.transitions.objectValues():
-        value = (
-            transition.getId(),
-            exit_state_maps.get(transition.getId(), []),
-        )
-        if transition.new_state_id not in transition_maps:
-            transition_maps[transition.new_state_id] = [value]
-        else:
-            transition_maps[transition.new_state_id].append(value)
+    graph, paths = _transition_graph(workflow)
+    key = (from_state, to_state)
+    if key not in paths:
+        paths[key] = _find_path(graph, from_state, to_state)
 
-    if to_state not in transition_maps:
+    path = paths[key]
+    if path is None:
         # impossible to reach via this workflow
         return None
+    return list(path)
 
-    return _find_path(transition_maps, [], to_state, from_state)
 
-
-def _transition_to(obj, workflow, to_state, **kwargs):
+def _transition_to(obj, workflow, to_state, workflows=None, **kwargs):
     # move from the current state to the given state
     # via any route we can find
-    for wf in workflow.getWorkflowsFor(obj):
+    if workflows is None:
+        workflows = workflow.getWorkflowsFor(obj)
+    for wf in workflows:
         status = workflow.getStatusOf(wf.getId(), obj)
         if not status or not status.get('review_state'):
             continue
@@ -420,6 +1186,32 @@ def _transition_to(obj, workflow, to_state, **kwargs):
         break
 
 
+def _transition(obj, workflow, transition, to_state, kwargs, workflows=None):
+    """Perform a transition or move to a state, see :meth:`transition`."""
+    if transition is not None:
+        try:
+            workflow.doActionFor(obj, transition, **kwargs)
+        except WorkflowException:
+            transitions = [
+                action['id'] for action in workflow.listActions(object=obj)
+            ]
+
+            raise InvalidParameterError(
+                "Invalid transition '{}'.\n"
+                'Valid transitions are:\n'
+                '{}'.format(transition, '\n'.join(sorted(transitions))),
+            )
+    else:
+        _transition_to(obj, workflow, to_state, workflows, **kwargs)
+        if workflow.getInfoFor(obj, 'review_state') != to_state:
+            raise InvalidParameterError(
+                'Could not find workflow to set state to {} on {}'.format(
+                    to_state,
+                    obj,
+                ),
+            )
+
+
 @required_parameters('obj')
 @at_least_one_of('transition', 'to_state')
 @mutually_exclusive_parameters('transition', 'to_state')
@@ -443,28 +1235,69 @@ def transition(obj=None, transition=None, to_state=None, **kwargs):
     :Example: :ref:`content-transition-example`
     """
     workflow = portal.get_tool('portal_workflow')
-    if transition is not None:
-        try:
-            workflow.doActionFor(obj, transition, **kwargs)
-        except WorkflowException:
-            transitions = [
-                action['id'] for action in workflow.listActions(object=obj)
-            ]
+    _transition(obj, workflow, transition, to_state, kwargs)
 
-            raise InvalidParameterError(
-                "Invalid transition '{}'.\n"
-                'Valid transitions are:\n'
-                '{}'.format(transition, '\n'.join(sorted(transitions))),
-            )
-    else:
-        _transition_to(obj, workflow, to_state, **kwargs)
-        if workflow.getInfoFor(obj, 'review_state') != to_state:
-            raise InvalidParameterError(
-                'Could not find workflow to set state to {} on {}'.format(
-                    to_state,
-                    obj,
-                ),
+
+@required_parameters('objects')
+@at_least_one_of('transition', 'to_state')
+@mutually_exclusive_parameters('transition', 'to_state')
+def transition_many(objects=None, transition=None, to_state=None, **kwargs):
+    """Perform a workflow transition, or move to a workflow state, for many
+    objects at once.
+
+    Works like :meth:`transition`, but the workflows of objects of the same
+    type in the same container are only looked up once, and the catalog is
+    updated once, after all objects have been transitioned. An object that
+    cannot be transitioned does not stop the others.
+
+    Accepts kwargs to supply to the workflow policy in use, such as "comment"
+
+    :param objects: [required] Objects for which we want to perform the
+        workflow transition.
+    :type objects: List of content objects
+    :param transition: Name of the workflow transition.
+    :type transition: string
+    :param to_state: Name of the workflow state.
+    :type to_state: string
+    :returns: For each object, in the order of ``objects``, a tuple of the
+        object and None on success, or the
+        :class:`~plone.api.exc.InvalidParameterError` or
+        ``WorkflowException`` that explains why the object could not be
+        transitioned.
+    :rtype: List of tuples
+    :raises:
+        :class:`~plone.api.exc.MissingParameterError`,
+        :class:`~plone.api.exc.InvalidParameterError`
+    :Example: :ref:`content-transition-many-example`
+    """
+    workflow = portal.get_tool('portal_workflow')
+    chains = {}
+    results = []
+
+    for obj in objects:
+        workflows = None
+        if to_state is not None:
+            # The chain depends on the type and, with placeful workflow
+            # policies, on the location of the object.
+            key = (
+                obj.portal_type,
+                aq_parent(aq_inner(obj)).getPhysicalPath(),
+                obj.getId() if base_hasattr(obj, _POLICY_CONFIG) else None,
             )
+            workflows = chains.get(key)
+            if workflows is None:
+                workflows = chains[key] = workflow.getWorkflowsFor(obj)
+
+        try:
+            _transition(obj, workflow, transition, to_state, kwargs, workflows)
+        except (InvalidParameterError, WorkflowException) as error:
+            # A WorkflowException means that the object has no workflow.
+            results.append((obj, error))
+        else:
+            results.append((obj, None))
+
+    processQueue()
+    return results
 
 
 @required_parameters('obj')
@@ -478,6 +1311,7 @@ def disable_roles_acquisition(obj=None):
     """
     plone_utils = portal.get_tool('plone_utils')
     plone_utils.acquireLocalRoles(obj, status=0)
+    _clear_path_cache()
 
 
 @required_parameters('obj')
@@ -491,6 +1325,7 @@ def enable_roles_acquisition(obj=None):
     """
     plone_utils = portal.get_tool('plone_utils')
     plone_utils.acquireLocalRoles(obj, status=1)
+    _clear_path_cache()
 
 
 @required_parameters('name', 'context', 'request')
@@ -503,6 +1338,10 @@ def get_view(name=None, context=None, request=None):
     :type context: context object
     :param request: [required] Request on which to get view.
     :type request: request object
+    :returns: The view. While the lookup cache of
+        :meth:`plone.api.portal.enable_lookup_cache` is enabled, the view
+        factory is looked up once per transaction for the interfaces that
+        context and request provide.
     :raises:
         :class:`~plone.api.exc.MissingParameterError`,
         :class:`~plone.api.exc.InvalidParameterError`
@@ -510,7 +1349,10 @@ def get_view(name=None, context=None, request=None):
     """
     # We do not use exceptionhandling to detect if the requested view is
     # available, because the __init__ of said view will contain
-    # errors in client code.
+    # errors in client code. Instead, look up the view factory first.
+    factory = _lookup_view(context, request, name)
+    if factory is not None:
+        return factory(context, request)
 
     # Get all available views...
     sm = getSiteManager()
@@ -521,17 +1363,39 @@ def get_view(name=None, context=None, request=None):
     # and get their names.
     available_view_names = [view[0] for view in available_views]
 
-    # Raise an error if the requested view is not available.
-    if name not in available_view_names:
-        raise InvalidParameterError(
-            "Cannot find a view with name '{name}'.\n"
-            'Available views are:\n'
-            '{views}'.format(
-                name=name,
-                views='\n'.join(sorted(available_view_names)),
-            ),
+    # Raise an error, as the requested view is not available.
+    raise InvalidParameterError(
+        "Cannot find a view with name '{name}'.\n"
+        'Available views are:\n'
+        '{views}'.format(
+            name=name,
+            views='\n'.join(sorted(available_view_names)),
+        ),
+    )
+
+
+def _lookup_view(context, request, name):
+    """Return the factory of the view ``name``, or None.
+
+    While the lookup cache of :func:`plone.api.portal.enable_lookup_cache`
+    is enabled, factories are cached by the interfaces of context and
+    request.
+    """
+    required = (providedBy(context), providedBy(request))
+    cache = portal._get_lookup_cache()
+    if cache is None:
+        return getSiteManager().adapters.lookup(required, Interface, name=name)
+
+    key = (_lookup_view, name) + required
+    try:
+        return cache[key]
+    except KeyError:
+        factory = cache[key] = getSiteManager().adapters.lookup(
+            required,
+            Interface,
+            name=name,
         )
-    return getMultiAdapter((context, request), name=name)
+        return factory
 
 
 @required_parameters('obj')
@@ -588,18 +1452,8 @@ def _parse_object_provides_query(query):
     return result
 
 
-def find(context=None, depth=None, **kwargs):
-    """Find content in the portal.
-
-    :param context: Context for the search
-    :type obj: Content object
-    :param depth: How far in the content tree we want to search from context
-    :type obj: Content object
-    :returns: Catalog brains
-    :rtype: List
-    :Example: :ref:`content-find-example`
-
-    """
+def _find_query(context, depth, kwargs):
+    """Build the catalog query for :meth:`find` and :meth:`find_iter`."""
     query = {}
     query.update(**kwargs)
 
@@ -634,11 +1488,197 @@ def find(context=None, depth=None, **kwargs):
     if obj_provides:
         query['object_provides'] = _parse_object_provides_query(obj_provides)
 
-    # Make sure we don't dump the whole catalog.
+    return query
+
+
+# Index types whose statistics are used to estimate the number of matches.
+_ESTIMATED_INDEX_TYPES = ('FieldIndex', 'KeywordIndex', 'UUIDIndex')
+
+
+def _count_matches(index, value):
+    """Return the number of documents with ``value`` in a value index."""
+    try:
+        docids = index._index.get(value)
+    except TypeError:
+        # value cannot be compared with the keys of the index
+        return None
+    if docids is None:
+        return 0
+    if isinstance(docids, int):
+        return 1
+    return len(docids)
+
+
+def _estimate(index, value):
+    """Estimate how many documents match the query ``value`` on ``index``.
+
+    :returns: An upper bound of the number of matches, or None if there is
+        no cheap way to know.
+    """
+    if getattr(index, 'meta_type', None) not in _ESTIMATED_INDEX_TYPES:
+        return None
+
+    operator = 'or'
+    if isinstance(value, dict):
+        if set(value) - {'query', 'operator'}:
+            # range, not, ... queries
+            return None
+        operator = value.get('operator', operator)
+        value = value.get('query')
+    if not isinstance(value, (list, tuple, set)):
+        value = [value]
+    if not value or None in value:
+        return None
+
+    counts = [_count_matches(index, item) for item in value]
+    if None in counts:
+        return None
+    if operator == 'and':
+        return min(counts)
+    return sum(counts)
+
+
+def _plan(catalog, query):
+    """Order the indexes used in ``query`` by their selectivity.
+
+    :returns: (index name, estimated number of matches) tuples, most
+        selective first. Indexes without an estimate come last.
+    """
+    indexes = catalog._catalog.indexes
+    plan = [
+        (name, _estimate(indexes[name], value))
+        for name, value in query.items()
+        if name in indexes
+    ]
+    plan.sort(key=lambda step: (step[1] is None, step[1] or 0))
+    return plan
+
+
+def _search(query):
+    """Query the catalog, unless the query would dump the whole catalog.
+
+    If one of the indexes in the query does not match anything, the catalog
+    is not queried at all.
+
+    :returns: Catalog brains, or None if there is no valid index in the query
+    """
     catalog = portal.get_tool('portal_catalog')
-    indexes = catalog.indexes()
-    valid_indexes = [index for index in query if index in indexes]
-    if not valid_indexes:
-        return []
+    # Make the index statistics reflect pending changes.
+    processQueue()
+    plan = _plan(catalog, query)
+    if not plan:
+        return None
+    if plan[0][1] == 0:
+        return LazyCat([])
 
     return catalog(**query)
+
+
+def find(context=None, depth=None, **kwargs):
+    """Find content in the portal.
+
+    :param context: Context for the search
+    :type obj: Content object
+    :param depth: How far in the content tree we want to search from context
+    :type obj: Content object
+    :returns: Catalog brains
+    :rtype: List
+    :Example: :ref:`content-find-example`
+
+    """
+    results = _search(_find_query(context, depth, kwargs))
+    if results is None:
+        return []
+    return results
+
+
+def find_iter(
+    context=None,
+    depth=None,
+    batch_size=100,
+    objects=False,
+    deactivate=False,
+    **kwargs  # NOQA: C816, S101
+):
+    """Find content in the portal, and iterate over the results in batches.
+
+    Accepts the same query as :meth:`find`. Brains are only created one batch
+    at a time. When iterating over objects, the objects of each batch can be
+    turned back into ghosts once the next batch is loaded, so that memory
+    usage stays flat.
+
+    :param context: Context for the search
+    :type obj: Content object
+    :param depth: How far in the content tree we want to search from context
+    :type obj: Content object
+    :param batch_size: Number of results to load at once.
+    :type batch_size: int
+    :param objects: When True, yield content objects instead of brains.
+        Results that the current user is not allowed to access are skipped.
+    :type objects: boolean
+    :param deactivate: When True, turn the objects of a batch into ghosts
+        once the batch has been processed. Modified objects are left alone.
+    :type deactivate: boolean
+    :returns: Catalog brains or content objects
+    :rtype: Iterator
+    :Example: :ref:`content-find-iter-example`
+    """
+    if batch_size < 1:
+        raise InvalidParameterError('batch_size has to be a positive integer')
+
+    results = _search(_find_query(context, depth, kwargs))
+    if results is None:
+        return
+
+    for start in range(0, len(results), batch_size):
+        batch = results[start:start + batch_size]
+        if not objects:
+            yield from batch
+            continue
+
+        objs = []
+        for brain in batch:
+            try:
+                objs.append(brain.getObject())
+            except (KeyError, AttributeError, Unauthorized):
+                # stale catalog entry or no access
+                continue
+        if not objs:
+            continue
+
+        yield from objs
+
+        if deactivate:
+            for obj in objs:
+                aq_base(obj)._p_deactivate()
+            connection = aq_base(objs[0])._p_jar
+            if connection is not None:
+                connection.cacheGC()
+
+
+def explain(context=None, depth=None, **kwargs):
+    """Explain how a search with :meth:`find` would be run.
+
+    Takes the same arguments as :meth:`find`.
+
+    :returns: The normalized catalog query (``query``), the number of
+        cataloged objects (``size``) and the indexes of the query, most
+        selective first, with an estimate of how many objects each of them
+        matches (``plan``). The estimate is None for indexes that cannot
+        be estimated cheaply, like text and path indexes. If there is no
+        valid index in the query, ``plan`` is empty and :meth:`find` will
+        not search at all.
+    :rtype: dict
+    :Example: :ref:`content-explain-example`
+    """
+    query = _find_query(context, depth, kwargs)
+    catalog = portal.get_tool('portal_catalog')
+    processQueue()
+    return {
+        'query': query,
+        'size': len(catalog),
+        'plan': [
+            {'index': name, 'estimate': estimate}
+            for name, estimate in _plan(catalog, query)
+        ],
+    }
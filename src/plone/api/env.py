@@ -2,20 +2,32 @@ from AccessControl.SecurityManagement import getSecurityManager
 from AccessControl.SecurityManagement import newSecurityManager
 from AccessControl.SecurityManagement import setSecurityManager
 from App.config import getConfiguration
-from contextlib import closing
-from contextlib import contextmanager
-from pkg_resources import get_distribution
 from plone.api import portal
 from plone.api.exc import InvalidParameterError
 from plone.api.exc import UserNotFoundError
 from plone.api.validation import at_least_one_of
 from plone.api.validation import mutually_exclusive_parameters
 from plone.api.validation import required_parameters
+from zope.component.hooks import getSite
 from zope.globalrequest import getRequest
 
-import traceback
+import functools
+import operator
+import os
+import re
+import sys
+import threading
+import time
 import Zope2
 
+try:
+    from importlib.metadata import version as distribution_version
+except ImportError:  # Python < 3.8
+    from importlib_metadata import version as distribution_version
+
+
+# Environment variable to turn test mode on ('1') or off ('0')
+TEST_MODE_VARIABLE = 'PLONE_API_TEST_MODE'
 
 IS_TEST = None
 
@@ -25,12 +37,117 @@ IS_TEST = None
 def adopt_user(username=None, user=None):
     """Context manager for temporarily switching user inside a block.
 
+    The user is looked up right away. The returned object can be entered
+    more than once, also nested, and decorates functions to run them as
+    that user.
+
     :param user: User object to switch to inside block.
     :type user: user object from acl_users.getUser() or api.user.get().
     :param username: username of user to switch to inside block.
     :type username: string
     :Example: :ref:`env-adopt-user-example`
     """
+    return _AdoptUser(_get_user(username, user))
+
+
+# Opt-in cache of the users looked up by adopt_user, see enable_user_cache().
+# It outlives transactions, but is only valid for the site hook that it was
+# filled in.
+_user_cache = threading.local()
+
+
+def _get_user_cache():
+    """Return the user cache dictionary, or None if caching is off."""
+    users = getattr(_user_cache, 'users', None)
+    if users is None:
+        return None
+
+    site = getSite()
+    if _user_cache.site is not site:
+        # The site hook changed, cached users may belong to another site.
+        _user_cache.site = site
+        users.clear()
+    return users
+
+
+def enable_user_cache(ttl=300):
+    """Cache the users that :meth:`adopt_user` looks up.
+
+    Once enabled, adopting the same user again, also through
+    :meth:`plone.api.user.has_permission` and
+    :meth:`plone.api.user.get_permissions`, does not ask ``acl_users``
+    for it until ``ttl`` seconds have passed. Roles and groups of a cached
+    user are not updated either, unless they are changed with ``plone.api``
+    or :meth:`invalidate_user_cache` is called. The cache lasts until
+    :meth:`disable_user_cache` is called or the site hook changes.
+
+    :param ttl: Number of seconds to keep a user.
+    :type ttl: int or float
+    :Example: :ref:`env-enable-user-cache-example`
+    """
+    if _get_user_cache() is None:
+        _user_cache.site = getSite()
+        _user_cache.users = {}
+    _user_cache.ttl = ttl
+
+
+def disable_user_cache():
+    """Drop the cache set up by :meth:`enable_user_cache`.
+
+    :Example: :ref:`env-enable-user-cache-example`
+    """
+    _user_cache.users = None
+
+
+@mutually_exclusive_parameters('username', 'user')
+def invalidate_user_cache(username=None, user=None):
+    """Drop a user from the cache set up by :meth:`enable_user_cache`.
+
+    Arguments ``username`` and ``user`` are mutually exclusive. If neither
+    is given, all users are dropped.
+
+    :param username: Username of the user to drop.
+    :type username: string
+    :param user: User to drop.
+    :type user: user object
+    :Example: :ref:`env-enable-user-cache-example`
+    """
+    users = _get_user_cache()
+    if users is None:
+        return
+    if username is None and user is None:
+        users.clear()
+        return
+
+    for key, (expires, cached) in list(users.items()):
+        if user is None:
+            found = cached.getUserName() == username
+        else:
+            found = cached.getId() == user.getId()
+        if found:
+            del users[key]
+
+
+def _invalidate_user_cache(event):
+    """Clear the user cache when a user is deleted."""
+    invalidate_user_cache()
+
+
+def _get_user(username=None, user=None):
+    """Return the user to adopt, wrapped in the acl_users it comes from.
+
+    :raises: UserNotFoundError if there is no user called ``username``.
+    """
+    users = _get_user_cache()
+    if users is not None:
+        if username is None:
+            key = ('userid', user.getId())
+        else:
+            key = ('username', username)
+        entry = users.get(key)
+        if entry is not None and entry[0] > time.monotonic():
+            return entry[1]
+
     # Grab the user object out of acl_users because this function
     # accepts 'user' objects that are actually things like MemberData
     # objects, which AccessControl isn't so keen on.
@@ -50,6 +167,8 @@ def adopt_user(username=None, user=None):
             if unwrapped:
                 user = unwrapped.__of__(acl_users)
                 break
+        else:
+            return user
     else:
         for acl_users in acls:
             unwrapped = acl_users.getUser(username)
@@ -59,11 +178,12 @@ def adopt_user(username=None, user=None):
         else:
             raise UserNotFoundError
 
-    return _adopt_user(user)
+    if users is not None:
+        users[key] = (time.monotonic() + _user_cache.ttl, user)
+    return user
 
 
-@contextmanager
-def _adopt_user(user):
+class _AdoptUser:
     # Fortunately, AccessControl makes this fairly easy.
 
     # One reference to the current user is held by the security
@@ -75,18 +195,47 @@ def _adopt_user(user):
     # with a new one whose context refers to the new user object.
     # Run the block, then put the original security manager back.
 
-    old_security_manager = getSecurityManager()
-    newSecurityManager(getRequest(), user)
+    # The original security managers are kept on a stack, so the same
+    # object can be entered again while it is active.
+
+    __slots__ = ('user', '_saved')
+
+    def __init__(self, user):
+        self.user = user
+        self._saved = []
+
+    def _enter(self):
+        old_security_manager = getSecurityManager()
+        newSecurityManager(getRequest(), self.user)
+        return old_security_manager
 
-    yield
+    def __enter__(self):
+        self._saved.append(self._enter())
 
-    setSecurityManager(old_security_manager)
+    def __exit__(self, exc_type, exc_value, traceback):
+        setSecurityManager(self._saved.pop())
+
+    def __call__(self, func):
+        # Decorated functions may run in several threads at once, so they
+        # keep the original security manager to themselves.
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            old_security_manager = self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                setSecurityManager(old_security_manager)
+
+        return wrapper
 
 
 @required_parameters('roles')
 def adopt_roles(roles=None):
     """Context manager for temporarily switching roles.
 
+    The returned object can be entered more than once, also nested, and
+    decorates functions to run them with the roles.
+
     :param roles: New roles to gain inside block. Existing roles will be lost.
     :type roles: list of strings
     :Example: :ref:`env-adopt-roles-example`
@@ -97,33 +246,60 @@ def adopt_roles(roles=None):
     if not roles:
         raise InvalidParameterError("Can't set an empty set of roles.")
 
-    return _adopt_roles(roles)
+    return _AdoptRoles(roles)
 
 
-@contextmanager
-def _adopt_roles(roles):
+class _AdoptRoles:
     # Okay, this is fun. Start by reading AccessControl/interfaces.py
 
     # ISecurityManager has a pair of methods addContext and removeContext,
-    # which are used here surrounding the block ("yield" in @contextmanager
-    # executes the body of the "with" block).
+    # which are used here surrounding the block.
 
     # addContext/removeContext add/pop items from a stack of security_contexts
     # Only the uppermost object in the stack is consulted during any given
     # permission check.
 
     # If the stack is empty, the default security policy gets used.
-    overriding_context = _GlobalRoleOverridingContext(roles)
 
-    security_manager = getSecurityManager()
-    security_manager.addContext(overriding_context)
+    # One overriding context serves all entries. The security managers it
+    # was added to are kept on a stack, so the same object can be entered
+    # again while it is active.
+
+    __slots__ = ('_overriding_context', '_security_managers')
+
+    def __init__(self, roles):
+        self._overriding_context = _GlobalRoleOverridingContext(roles)
+        self._security_managers = []
+
+    def _enter(self):
+        security_manager = getSecurityManager()
+        security_manager.addContext(self._overriding_context)
+        return security_manager
+
+    def __enter__(self):
+        self._security_managers.append(self._enter())
 
-    yield
+    def __exit__(self, exc_type, exc_value, traceback):
+        security_manager = self._security_managers.pop()
+        security_manager.removeContext(self._overriding_context)
 
-    security_manager.removeContext(overriding_context)
+    def __call__(self, func):
+        # Decorated functions may run in several threads at once, so they
+        # keep the security manager to themselves.
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            security_manager = self._enter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                security_manager.removeContext(self._overriding_context)
+
+        return wrapper
 
 
 class _GlobalRoleOverridingContext:
+    __slots__ = ('_proxy_roles', )
+
     # ZopeSecurityPolicy will use security_context._proxy_roles in place of
     # the roles that would normally be active, provided that it happens to
     # consider the security_context object to be relevant.
@@ -186,45 +362,196 @@ def debug_mode():
 
 
 def test_mode():
-    """Returns True if you are running the zope test runner.
+    """Returns True if you are running tests.
+
+    Test layers say so with :meth:`set_test_mode`. Otherwise the
+    ``PLONE_API_TEST_MODE`` environment variable decides, and if that is not
+    set either, whether the zope test runner is loaded. The answer is
+    cached.
 
     :Example: :ref:`env-test-mode-example`
     """
     global IS_TEST
 
     if IS_TEST is None:
-        IS_TEST = False
-        for frame in traceback.extract_stack():
-            if 'testrunner' in frame[0] or 'testreport/runner' in frame[0]:
-                IS_TEST = True
-                break
+        value = os.environ.get(TEST_MODE_VARIABLE)
+        if value is not None:
+            IS_TEST = value.strip().lower() in ('1', 'true', 'yes', 'on')
+        else:
+            IS_TEST = 'zope.testrunner' in sys.modules
 
     return IS_TEST
 
 
+def set_test_mode(enabled=True):
+    """Set whether tests are running, for :meth:`test_mode`.
+
+    Test layers call this when they are set up and with ``None`` when they
+    are torn down.
+
+    :param enabled: True if tests are running, False if not, None to detect
+        it again on the next call of :meth:`test_mode`.
+    :type enabled: boolean
+    :Example: :ref:`env-test-mode-example`
+    """
+    global IS_TEST
+
+    IS_TEST = None if enabled is None else bool(enabled)
+
+
 def read_only_mode():
     """Check if the Zope instance is running on a read-only ZODB.
 
     :returns: bool isReadOnly True if ZODB is read-only
     :Example: :ref:`env-read-only-mode-example`
     """
-    with closing(Zope2.DB.open()) as connection:
+    # Ask the connection that the current request already uses, opening
+    # one only to ask this question takes one from the pool.
+    connection = getattr(getSite(), '_p_jar', None)
+    if connection is not None:
         return connection.isReadOnly()
+    return Zope2.DB.storage.isReadOnly()
+
+
+# Version numbers as in PEP 440: release, pre-release, post-release and
+# development release. Anything after that, like a local version, is ignored.
+_VERSION_RE = re.compile(
+    r'(?P<release>\d+(?:\.\d+)*)'
+    r'(?:[-_.]?(?P<pre_l>alpha|a|beta|b|rc|c|preview|pre)[-_.]?(?P<pre_n>\d*))?'
+    r'(?:[-_.]?(?:post|rev|r)[-_.]?(?P<post>\d*))?'
+    r'(?:[-_.]?dev[-_.]?(?P<dev>\d*))?',
+    re.IGNORECASE,
+)
+
+_PRE_RELEASE_PHASES = {
+    'alpha': 0,
+    'a': 0,
+    'beta': 1,
+    'b': 1,
+    'rc': 2,
+    'c': 2,
+    'preview': 2,
+    'pre': 2,
+}
+
+
+def _version_key(version):
+    """Return a tuple that sorts like the PEP 440 version ``version``.
+
+    :returns: The tuple, or None if ``version`` is not a version number.
+    """
+    if isinstance(version, tuple):
+        version = '.'.join(str(part) for part in version)
+    match = _VERSION_RE.match(version.strip().lstrip('vV'))
+    if match is None:
+        return None
+
+    release = tuple(int(part) for part in match.group('release').split('.'))
+    # 6 == 6.0 == 6.0.0
+    while release[-1:] == (0, ) and len(release) > 1:
+        release = release[:-1]
+    post = match.group('post')
+    dev = match.group('dev')
+    if match.group('pre_l'):
+        pre = (
+            _PRE_RELEASE_PHASES[match.group('pre_l').lower()],
+            int(match.group('pre_n') or 0),
+        )
+    elif dev is not None and post is None:
+        # 6.0.dev1 comes before 6.0a1
+        pre = (-1, 0)
+    else:
+        pre = (3, 0)
+    return (
+        release,
+        pre,
+        -1 if post is None else int(post or 0),
+        (1, 0) if dev is None else (0, int(dev or 0)),
+    )
+
+
+class Version(str):
+    """A version number that orders as a version.
+
+    It is a string, but ordering it against a version string or a tuple of
+    numbers compares the versions: ``Version('10.0') > '9.3'`` and
+    ``Version('6.0.1') >= (6, 0)`` are both True. Equality and hashing are
+    those of the string, so ``Version('6.0') == '6'`` is False; compare
+    ``release`` to ignore trailing zeros. Strings that are not version
+    numbers are ordered as strings.
+
+    :ivar release: The release numbers, e.g. ``(6, 0, 1)``
+    :vartype release: tuple of integers
+    """
+
+    def __new__(cls, version):
+        self = super().__new__(cls, version)
+        self._key = _version_key(version)
+        match = _VERSION_RE.match(version.strip().lstrip('vV'))
+        self.release = tuple(
+            int(part) for part in match.group('release').split('.')
+        ) if match else ()
+        return self
+
+    def _compare(self, other, compare):
+        if isinstance(other, Version):
+            key = other._key
+        elif isinstance(other, (str, tuple)):
+            key = _version_key(other)
+        else:
+            return NotImplemented
+        if self._key is None or key is None:
+            if isinstance(other, tuple):
+                return NotImplemented
+            return compare(str(self), str(other))
+        return compare(self._key, key)
+
+    def __lt__(self, other):
+        return self._compare(other, operator.lt)
+
+    def __le__(self, other):
+        return self._compare(other, operator.le)
+
+    def __gt__(self, other):
+        return self._compare(other, operator.gt)
+
+    def __ge__(self, other):
+        return self._compare(other, operator.ge)
+
+
+# Versions by distribution name, they do not change while Zope runs.
+_versions = {}
+
+
+def _distribution_version(name):
+    try:
+        return _versions[name]
+    except KeyError:
+        version = _versions[name] = Version(distribution_version(name))
+        return version
 
 
 def plone_version():
     """Return Plone version number.
 
+    The version is looked up once per process. It is a string that compares
+    as a version, see :class:`Version`.
+
     :returns: string denoting what release of Plone this distribution contains
+    :rtype: :class:`Version`
     :Example: :ref:`env-plone-version-example`
     """
-    return get_distribution('Products.CMFPlone').version
+    return _distribution_version('Products.CMFPlone')
 
 
 def zope_version():
     """Return Zope 2 version number.
 
+    The version is looked up once per process. It is a string that compares
+    as a version, see :class:`Version`.
+
     :returns: string denoting what release of Zope2 this distribution contains
+    :rtype: :class:`Version`
     :Example: :ref:`env-zope-version-example`
     """
-    return get_distribution('Zope2').version
+    return _distribution_version('Zope2')
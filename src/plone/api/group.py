@@ -1,5 +1,7 @@
 """Module that provides functionality for group manipulation."""
 
+from plone.api import content
+from plone.api import env
 from plone.api import portal
 from plone.api.exc import GroupNotFoundError
 from plone.api.exc import UserNotFoundError
@@ -124,6 +126,7 @@ def delete(groupname=None, group=None):
     if group:
         groupname = group.id
 
+    env.invalidate_user_cache()
     return group_tool.removeGroup(groupname)
 
 
@@ -163,6 +166,7 @@ def add_user(groupname=None, group=None, username=None, user=None):
     group_id = groupname or group.id
     portal_groups = portal.get_tool('portal_groups')
     portal_groups.addPrincipalToGroup(user_id, group_id)
+    env.invalidate_user_cache(user=user)
 
 
 @mutually_exclusive_parameters('groupname', 'group')
@@ -199,6 +203,7 @@ def remove_user(groupname=None, group=None, username=None, user=None):
     group_id = groupname or group.id
     portal_groups = portal.get_tool('portal_groups')
     portal_groups.removePrincipalFromGroup(user_id, group_id)
+    env.invalidate_user_cache(user=user)
 
 
 @mutually_exclusive_parameters('groupname', 'group')
@@ -292,8 +297,10 @@ def grant_roles(groupname=None, group=None, roles=None, obj=None):
 
     if obj is None:
         portal_groups.setRolesForGroup(group_id=group_id, roles=roles)
+        env.invalidate_user_cache()
     else:
         obj.manage_setLocalRoles(group_id, roles)
+        content._clear_path_cache()
 
 
 @required_parameters('roles')
@@ -338,7 +345,10 @@ def revoke_roles(groupname=None, group=None, roles=None, obj=None):
 
     if obj is None:
         portal_groups.setRolesForGroup(group_id=group_id, roles=roles)
-    elif roles:
-        obj.manage_setLocalRoles(group_id, roles)
+        env.invalidate_user_cache()
     else:
-        obj.manage_delLocalRoles([group_id])
+        if roles:
+            obj.manage_setLocalRoles(group_id, roles)
+        else:
+            obj.manage_delLocalRoles([group_id])
+        content._clear_path_cache()
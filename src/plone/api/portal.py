@@ -1,13 +1,18 @@
 """Module that provides various utility methods on the portal level."""
 
 from Acquisition import aq_inner
+from array import array
+from bisect import bisect_right
 from email.utils import formataddr
 from email.utils import parseaddr
 from logging import getLogger
 from plone.api.exc import CannotGetPortalError
 from plone.api.exc import InvalidParameterError
+from plone.api.validation import at_least_one_of
 from plone.api.validation import required_parameters
 from plone.app.layout.navigation.root import getNavigationRootObject
+from plone.registry.interfaces import IRecordAddedEvent
+from plone.registry.interfaces import IRecordRemovedEvent
 from plone.registry.interfaces import IRegistry
 from Products.CMFCore.interfaces import ISiteRoot
 from Products.CMFCore.utils import getToolByName
@@ -17,39 +22,71 @@ from zope.component import providedBy
 from zope.component.hooks import getSite
 from zope.globalrequest import getRequest
 from zope.interface.interfaces import IInterface
+from zope.schema import getFieldNamesInOrder
 
 import datetime as dtime
-import pkg_resources
+import threading
+import transaction
 
 
 logger = getLogger('plone.api.portal')
 
-try:
-    from Products import PrintingMailHost
-except ImportError:
-    PrintingMailHost = None
-
-if not PrintingMailHost:
-    PRINTINGMAILHOST_ENABLED = False
-elif (
-    PrintingMailHost.ENABLED is not None
-    and PrintingMailHost.ENABLED.lower() in PrintingMailHost.TRUISMS
-):
-    PRINTINGMAILHOST_ENABLED = True
-elif (
-    PrintingMailHost.ENABLED is None
-    and PrintingMailHost.DevelopmentMode is True
-):
-    PRINTINGMAILHOST_ENABLED = True
-else:
-    # PrintingMailHost only patches in debug mode.
-    # plone.api.env.debug_mode cannot be used here, because .env imports this
-    # file
-    from App.config import getConfiguration
-    PRINTINGMAILHOST_ENABLED = getConfiguration().debug_mode
+# Whether Products.PrintingMailHost prints mails instead of sending them,
+# see _printingmailhost_enabled(). None until it is first needed.
+PRINTINGMAILHOST_ENABLED = None
 
 MISSING = object()
 
+# Opt-in cache of the portal and tool lookups, see enable_lookup_cache().
+# It is only valid for the transaction and the site hook that it was
+# filled in.
+_lookup_cache = threading.local()
+
+
+def _get_lookup_cache():
+    """Return the lookup cache dictionary, or None if caching is off."""
+    txn = getattr(_lookup_cache, 'transaction', None)
+    if txn is None:
+        return None
+    if txn is not transaction.get():
+        # The transaction (and with it the request) is over.
+        _lookup_cache.transaction = None
+        _lookup_cache.values = None
+        return None
+
+    site = getSite()
+    if _lookup_cache.site is not site:
+        # The site hook changed, cached objects may belong to another site.
+        _lookup_cache.site = site
+        _lookup_cache.values = {}
+    return _lookup_cache.values
+
+
+def enable_lookup_cache():
+    """Cache the portal object and tools for the current transaction.
+
+    Once enabled, :meth:`get` and :meth:`get_tool` only walk the
+    acquisition chain and look up a tool once per transaction, and
+    :meth:`get_registry_record` reads a record once until it changes. The
+    cache is dropped when the transaction ends or the site hook changes.
+
+    :Example: :ref:`portal-enable-lookup-cache-example`
+    """
+    if _get_lookup_cache() is not None:
+        return
+    _lookup_cache.transaction = transaction.get()
+    _lookup_cache.site = getSite()
+    _lookup_cache.values = {}
+
+
+def disable_lookup_cache():
+    """Drop the cache set up by :meth:`enable_lookup_cache`.
+
+    :Example: :ref:`portal-enable-lookup-cache-example`
+    """
+    _lookup_cache.transaction = None
+    _lookup_cache.values = None
+
 
 def get():
     """Get the Plone portal object out of thin air.
@@ -61,7 +98,16 @@ def get():
     :rtype: Portal object
     :Example: :ref:`portal-get-example`
     """
+    cache = _get_lookup_cache()
+    if cache is not None:
+        portal = cache.get(ISiteRoot)
+        if portal is None:
+            portal = cache[ISiteRoot] = _get()
+        return portal
+    return _get()
+
 
+def _get():
     closest_site = getSite()
     if closest_site is not None:
         for potential_portal in closest_site.aq_chain:
@@ -104,8 +150,14 @@ def get_tool(name=None):
         :class:`~plone.api.exc.InvalidParameterError`
     :Example: :ref:`portal-get-tool-example`
     """
+    cache = _get_lookup_cache()
+    if cache is not None:
+        tool = cache.get(name)
+        if tool is not None:
+            return tool
+
     try:
-        return getToolByName(get(), name)
+        tool = getToolByName(get(), name)
     except AttributeError:
 
         # get a list of all tools to display their names in the error msg
@@ -121,6 +173,43 @@ def get_tool(name=None):
             '{tools}'.format(name=name, tools='\n'.join(tools)),
         )
 
+    if cache is not None:
+        cache[name] = tool
+    return tool
+
+
+def _printingmailhost_enabled():
+    """Return whether Products.PrintingMailHost is installed and enabled."""
+    global PRINTINGMAILHOST_ENABLED
+
+    if PRINTINGMAILHOST_ENABLED is not None:
+        return PRINTINGMAILHOST_ENABLED
+
+    try:
+        from Products import PrintingMailHost
+    except ImportError:
+        PrintingMailHost = None
+
+    if not PrintingMailHost:
+        PRINTINGMAILHOST_ENABLED = False
+    elif (
+        PrintingMailHost.ENABLED is not None
+        and PrintingMailHost.ENABLED.lower() in PrintingMailHost.TRUISMS
+    ):
+        PRINTINGMAILHOST_ENABLED = True
+    elif (
+        PrintingMailHost.ENABLED is None
+        and PrintingMailHost.DevelopmentMode is True
+    ):
+        PRINTINGMAILHOST_ENABLED = True
+    else:
+        # PrintingMailHost only patches in debug mode.
+        # plone.api.env.debug_mode cannot be used here, because .env imports
+        # this file
+        from App.config import getConfiguration
+        PRINTINGMAILHOST_ENABLED = getConfiguration().debug_mode
+    return PRINTINGMAILHOST_ENABLED
+
 
 @required_parameters('recipient', 'subject', 'body')
 def send_email(
@@ -151,7 +240,7 @@ def send_email(
     """
     portal = get()
 
-    if not PRINTINGMAILHOST_ENABLED:
+    if not _printingmailhost_enabled():
         from plone.api import content
         ctrlOverview = content.get_view(
             context=portal,
@@ -253,7 +342,12 @@ def show_message(message=None, request=None, type='info'):
 
 
 @required_parameters('name')
-def get_registry_record(name=None, interface=None, default=MISSING):
+def get_registry_record(
+    name=None,
+    interface=None,
+    default=MISSING,
+    suggest=True,
+):
     """Get a record value from ``plone.app.registry``
 
     :param name: [required] Name
@@ -263,6 +357,9 @@ def get_registry_record(name=None, interface=None, default=MISSING):
     :type interface: zope.interface.Interface
     :param default: The value returned if the record is not found
     :type default: anything
+    :param suggest: If the record is not found, suggest records with similar
+        names in the error message.
+    :type suggest: boolean
     :returns: Registry record value
     :rtype: plone.app.registry registry record
     :Example: :ref:`portal-get-registry-record-example`
@@ -276,13 +373,16 @@ def get_registry_record(name=None, interface=None, default=MISSING):
             'zope.interface.Interface',
         )
 
-    registry = getUtility(IRegistry)
+    registry = _get_registry()
 
     if interface is not None:
-        records = registry.forInterface(interface, check=False)
-        _marker = object()
-        if getattr(records, name, _marker) != _marker:
-            return registry['{}.{}'.format(interface.__identifier__, name)]
+        if name in interface:
+            value = _get_registry_value(
+                registry,
+                '{}.{}'.format(interface.__identifier__, name),
+            )
+            if value is not MISSING:
+                return value
 
         if default is not MISSING:
             return default
@@ -301,8 +401,9 @@ def get_registry_record(name=None, interface=None, default=MISSING):
         )
         raise InvalidParameterError(msg)
 
-    if name in registry:
-        return registry[name]
+    value = _get_registry_value(registry, name)
+    if value is not MISSING:
+        return value
 
     if default is not MISSING:
         return default
@@ -312,7 +413,7 @@ def get_registry_record(name=None, interface=None, default=MISSING):
     msg = (
         "Cannot find a record with name '{name}'".format(name=name)
     )
-    records = [key for key in registry.records.keys() if name in key]
+    records = _suggest_records(registry, name) if suggest else []
     if records:
         msg = (
             '{message}\n'
@@ -322,6 +423,165 @@ def get_registry_record(name=None, interface=None, default=MISSING):
     raise InvalidParameterError(msg)
 
 
+@at_least_one_of('names', 'interface')
+def get_registry_records(names=None, interface=None, default=MISSING):
+    """Get many record values from ``plone.app.registry`` at once
+
+    :param names: Names of the records. With ``interface``, the names of
+        its fields, all of them if not given.
+    :type names: list of strings
+    :param interface: interface whose attributes are plone.app.registry
+        settings
+    :type interface: zope.interface.Interface
+    :param default: The value for the records that are not found
+    :type default: anything
+    :returns: Registry record values by name
+    :rtype: dict
+    :raises:
+        :class:`~plone.api.exc.MissingParameterError`,
+        :class:`~plone.api.exc.InvalidParameterError`
+    :Example: :ref:`portal-get-registry-records-example`
+    """
+    if isinstance(names, str):
+        raise InvalidParameterError(
+            "The 'names' parameter has to be a list of strings",
+        )
+
+    if interface is not None and not IInterface.providedBy(interface):
+        raise InvalidParameterError(
+            'The interface parameter has to derive from '
+            'zope.interface.Interface',
+        )
+
+    if names is None:
+        names = getFieldNamesInOrder(interface)
+    prefix = '' if interface is None else interface.__identifier__ + '.'
+    registry = _get_registry()
+
+    records = {}
+    for name in names:
+        value = MISSING
+        if isinstance(name, str) and (interface is None or name in interface):
+            value = _get_registry_value(registry, prefix + name)
+        if value is MISSING:
+            if default is MISSING:
+                # Raise the error of a single missing record.
+                get_registry_record(name=name, interface=interface)
+            value = default
+        records[name] = value
+    return records
+
+
+def _get_registry():
+    cache = _get_lookup_cache()
+    if cache is None:
+        return getUtility(IRegistry)
+    registry = cache.get(IRegistry)
+    if registry is None:
+        registry = cache[IRegistry] = getUtility(IRegistry)
+    return registry
+
+
+def _get_registry_value(registry, name):
+    """Return the value of the record ``name``, or ``MISSING``.
+
+    While the lookup cache of :func:`enable_lookup_cache` is enabled, values
+    are cached until a record changes.
+    """
+    cache = _get_lookup_cache()
+    if cache is None:
+        return registry.get(name, MISSING)
+
+    values = cache.setdefault(_get_registry_value, {})
+    try:
+        return values[name]
+    except KeyError:
+        value = values[name] = registry.get(name, MISSING)
+        return value
+
+
+def _invalidate_registry_cache(event):
+    """Drop the cached registry values when a record changes."""
+    cache = _get_lookup_cache()
+    if cache is not None:
+        cache.pop(_get_registry_value, None)
+    if IRecordAddedEvent.providedBy(event) or IRecordRemovedEvent.providedBy(
+        event,
+    ):
+        _suggestion_indexes.clear()
+
+
+class _SuggestionIndex:
+    """Find the record names that contain a string.
+
+    The index is a suffix array: the start positions of all suffixes of the
+    names, sorted by suffix. The suffixes that start with a string are next
+    to each other, so they are found with two binary searches.
+    """
+
+    def __init__(self, names):
+        self.names = sorted(names)
+        self.text = '\0'.join(self.names) + '\0'
+        self.starts = array('l')
+        position = 0
+        for name in self.names:
+            self.starts.append(position)
+            position += len(name) + 1
+        # Sorting by the suffix up to the end of its name is enough, as '\0'
+        # sorts before any other character.
+        suffixes = sorted(
+            (name[offset:], start + offset)
+            for start, name in zip(self.starts, self.names)
+            for offset in range(len(name))
+        )
+        self.suffixes = array('l', (index for suffix, index in suffixes))
+
+    def _bisect(self, string, right):
+        text = self.text
+        length = len(string)
+        low, high = 0, len(self.suffixes)
+        while low < high:
+            middle = (low + high) // 2
+            index = self.suffixes[middle]
+            prefix = text[index:index + length]
+            if prefix < string or (right and prefix == string):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find(self, string):
+        """Return the names that contain ``string``, in order."""
+        if not string or '\0' in string:
+            return []
+        found = {
+            bisect_right(self.starts, index) - 1
+            for index in self.suffixes[
+                self._bisect(string, False):self._bisect(string, True)
+            ]
+        }
+        return [self.names[index] for index in sorted(found)]
+
+
+# Suggestion indexes by (database name, oid) of the registry. They are
+# dropped when records are added or removed in this process.
+_suggestion_indexes = {}
+
+
+def _suggest_records(registry, name):
+    """Return the names of the records that contain ``name``."""
+    key = None
+    if getattr(registry, '_p_oid', None) is not None:
+        key = (registry._p_jar.db().database_name, registry._p_oid)
+    index = _suggestion_indexes.get(key)
+    if index is None:
+        index = _SuggestionIndex(registry.records.keys())
+        if key is not None:
+            _suggestion_indexes[key] = index
+    # Other processes may have removed records since the index was built.
+    return [record for record in index.find(name) if record in registry]
+
+
 @required_parameters('name', 'value')
 def set_registry_record(name=None, value=None, interface=None):
     """Set a record value in the ``plone.app.registry``
@@ -344,7 +604,7 @@ def set_registry_record(name=None, value=None, interface=None):
             'zope.interface.Interface',
         )
 
-    registry = getUtility(IRegistry)
+    registry = _get_registry()
 
     if interface is not None:
         # confirm that the name exists on the interface
@@ -375,6 +635,12 @@ def set_registry_record(name=None, value=None, interface=None):
 
         registry[name] = value
 
+    # Drop the cached values here, too, in case the IRecordEvent subscriber
+    # of configure.zcml is not registered.
+    cache = _get_lookup_cache()
+    if cache is not None:
+        cache.pop(_get_registry_value, None)
+
 
 def get_default_language():
     """Return the default language.
@@ -22,19 +22,32 @@ from zope.intid.interfaces import IIntIds
 from zope.lifecycleevent import modified
 
 import logging
-import pkg_resources
 
-try:
-    pkg_resources.get_distribution("plone.app.iterate")
-except pkg_resources.DistributionNotFound:
-    ITERATE_RELATION_NAME = None
-    StagingRelationValue = None
-else:
-    from plone.app.iterate.dexterity import ITERATE_RELATION_NAME
-    from plone.app.iterate.dexterity.relation import StagingRelationValue
+logger = logging.getLogger(__name__)
 
+# Name and value class of the relations of plone.app.iterate, see _iterate().
+_ITERATE = None
 
-logger = logging.getLogger(__name__)
+
+def _iterate():
+    """Return the relation name and value class of plone.app.iterate.
+
+    Both are None if plone.app.iterate is not installed. It is only looked
+    for on first use, not when this module is imported.
+    """
+    global _ITERATE
+
+    if _ITERATE is None:
+        try:
+            from plone.app.iterate.dexterity import ITERATE_RELATION_NAME
+            from plone.app.iterate.dexterity.relation import (
+                StagingRelationValue,
+            )
+        except ImportError:
+            _ITERATE = (None, None)
+        else:
+            _ITERATE = (ITERATE_RELATION_NAME, StagingRelationValue)
+    return _ITERATE
 
 
 def _get_field_and_schema_for_fieldname(field_id, portal_type):
@@ -178,13 +191,14 @@ def create(source=None, target=None, relationship=None):
         modifiedContent(source, None)
         return
 
+    iterate_relation_name, StagingRelationValue = _iterate()
     if (
-        ITERATE_RELATION_NAME is not None
-        and from_attribute == ITERATE_RELATION_NAME
+        iterate_relation_name is not None
+        and from_attribute == iterate_relation_name
     ):
         # Iterate relations use a subclass of RelationValue
         relation = StagingRelationValue(to_id)
-        event._setRelation(source, ITERATE_RELATION_NAME, relation)
+        event._setRelation(source, iterate_relation_name, relation)
         return
 
     # This can only get a field from a dexterity item.
@@ -21,9 +21,11 @@ class PloneApiLayer(PloneSandboxLayer):
         import plone.app.dexterity
         self.loadZCML(package=plone.app.dexterity)
         import plone.api
+        self.loadZCML(package=plone.api)
         self.loadZCML(package=plone.api, name='testing.zcml')
         import plone.app.contenttypes
         self.loadZCML(package=plone.app.contenttypes)
+        plone.api.env.set_test_mode()
 
     def setUpPloneSite(self, portal):
         """Prepare a Plone instance for testing."""
@@ -40,6 +42,8 @@ class PloneApiLayer(PloneSandboxLayer):
 
     def tearDownZope(self, app):
         """Tear down Zope."""
+        import plone.api
+        plone.api.env.set_test_mode(None)
 
 
 FIXTURE = PloneApiLayer()
@@ -0,0 +1,756 @@
+"""Micro-benchmarks for the public plone.api functions.
+
+The benchmarks are not collected by default. Run them with::
+
+    bin/test -s plone.api --test-file-pattern=benchmarks
+
+and configure the run with environment variables:
+
+``PLONE_API_BENCHMARK_SIZE``
+    Number of content objects, users and relations in the site
+    (default: 1000).
+``PLONE_API_BENCHMARK_OUTPUT``
+    File to write the results to, as JSON
+    (default: ``benchmark-results.json``).
+``PLONE_API_BENCHMARK_BASELINE``
+    Results of an earlier run. If given, the run fails when a function
+    got slower than the baseline by more than the tolerance.
+``PLONE_API_BENCHMARK_TOLERANCE``
+    Allowed slowdown relative to the baseline (default: 0.25, i.e. 25%).
+"""
+
+from collections import OrderedDict
+from plone import api
+from plone.api.tests.base import FIXTURE
+from plone.app.testing import IntegrationTesting
+from plone.app.testing import login
+from plone.app.testing import PloneSandboxLayer
+from plone.app.testing import setRoles
+from plone.app.testing import TEST_USER_ID
+from plone.app.testing import TEST_USER_NAME
+from Products.CMFPlone.tests.utils import MockMailHost
+from Products.MailHost.interfaces import IMailHost
+
+import inspect
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+import unittest
+
+
+SIZE = int(os.environ.get('PLONE_API_BENCHMARK_SIZE', 1000))
+OUTPUT = os.environ.get('PLONE_API_BENCHMARK_OUTPUT', 'benchmark-results.json')
+BASELINE = os.environ.get('PLONE_API_BENCHMARK_BASELINE')
+TOLERANCE = float(os.environ.get('PLONE_API_BENCHMARK_TOLERANCE', 0.25))
+
+# Content is spread over folders, so that no single container gets huge.
+FOLDER_SIZE = 100
+
+MODULES = ('content', 'env', 'group', 'portal', 'relation', 'user')
+
+# name -> (function, setup, number of calls)
+BENCHMARKS = OrderedDict()
+
+
+def benchmark(name, setup=None, number=100):
+    """Register a benchmark for the plone.api function ``name``.
+
+    The decorated function is called ``number`` times with the portal, the
+    index of the call and whatever ``setup(portal, number)`` returned.
+    Setup time is not measured.
+    """
+    def _benchmark(func):
+        BENCHMARKS[name] = (func, setup, number)
+        return func
+
+    return _benchmark
+
+
+def _document(index):
+    return api.content.get(
+        path='/folder-{}/document-{}'.format(index // FOLDER_SIZE, index),
+    )
+
+
+def _user(index):
+    return 'user-{}'.format(index)
+
+
+class BenchmarkLayer(PloneSandboxLayer):
+    """A site populated with ``SIZE`` documents, users and relations."""
+
+    defaultBases = (FIXTURE, )
+
+    def setUpPloneSite(self, portal):
+        setRoles(portal, TEST_USER_ID, ['Manager'])
+        login(portal, TEST_USER_NAME)
+        api.portal.set_registry_record('plone.email_from_name', 'Benchmark')
+        api.portal.set_registry_record(
+            'plone.email_from_address',
+            'benchmark@example.org',
+        )
+        api.group.create(groupname='benchmarkers')
+        for index in range(SIZE):
+            if not index % FOLDER_SIZE:
+                folder = api.content.create(
+                    container=portal,
+                    type='Folder',
+                    id='folder-{}'.format(index // FOLDER_SIZE),
+                )
+            api.content.create(
+                container=folder,
+                type='Document',
+                id='document-{}'.format(index),
+                title='Document {}'.format(index),
+            )
+            user = api.user.create(
+                username=_user(index),
+                email='{}@example.org'.format(_user(index)),
+            )
+            if not index % 10:
+                api.group.add_user(groupname='benchmarkers', user=user)
+        for index in range(SIZE):
+            api.relation.create(
+                source=_document(index),
+                target=_document((index + 1) % SIZE),
+                relationship='link',
+            )
+
+
+BENCHMARK_FIXTURE = BenchmarkLayer()
+BENCHMARK_TESTING = IntegrationTesting(
+    bases=(BENCHMARK_FIXTURE, ),
+    name='PloneApiLayer:Benchmark',
+)
+
+
+def _documents(portal, number):
+    return [_document(index % SIZE) for index in range(number)]
+
+
+def _new_documents(portal, number):
+    folder = api.content.create(container=portal, type='Folder', title='New')
+    return [
+        api.content.create(
+            container=folder,
+            type='Document',
+            id='document-{}'.format(index),
+        )
+        for index in range(number)
+    ]
+
+
+def _new_folders(portal, number):
+    """Create ``number`` folders with ``FOLDER_SIZE`` documents each."""
+    return [_new_documents(portal, FOLDER_SIZE) for index in range(number)]
+
+
+def _new_users(portal, number):
+    return [
+        api.user.create(
+            username='new-user-{}'.format(index),
+            email='new-user-{}@example.org'.format(index),
+        )
+        for index in range(number)
+    ]
+
+
+def _new_groups(portal, number):
+    return [
+        api.group.create(groupname='new-group-{}'.format(index))
+        for index in range(number)
+    ]
+
+
+def _mailhost(portal, number):
+    mailhost = MockMailHost('MailHost')
+    mailhost.smtp_host = 'localhost'
+    portal.MailHost = mailhost
+    portal.getSiteManager().registerUtility(mailhost, provided=IMailHost)
+
+
+# content
+
+@benchmark('content.create')
+def content_create(portal, index, state):
+    api.content.create(
+        container=portal['folder-0'],
+        type='Document',
+        title='Created {}'.format(index),
+    )
+
+
+@benchmark('content.create_many', number=10)
+def content_create_many(portal, index, state):
+    api.content.create_many(
+        container=portal['folder-0'],
+        items=[
+            {'type': 'Document', 'title': 'Created many {}'.format(index)}
+            for item in range(100)
+        ],
+    )
+
+
+@benchmark('content.get')
+def content_get(portal, index, state):
+    api.content.get(path='/folder-0/document-{}'.format(index % FOLDER_SIZE))
+
+
+@benchmark('content.enable_path_cache', number=1000)
+def content_enable_path_cache(portal, index, state):
+    api.content.enable_path_cache()
+
+
+@benchmark('content.disable_path_cache', number=1000)
+def content_disable_path_cache(portal, index, state):
+    api.content.disable_path_cache()
+
+
+@benchmark('content.get_many', number=20)
+def content_get_many(portal, index, state):
+    api.content.get_many(
+        paths=[
+            '/folder-0/document-{}'.format(document)
+            for document in range(FOLDER_SIZE)
+        ],
+    )
+
+
+@benchmark('content.move', setup=_new_documents)
+def content_move(portal, index, state):
+    api.content.move(source=state[index], target=portal['folder-0'])
+
+
+@benchmark('content.rename', setup=_new_documents)
+def content_rename(portal, index, state):
+    api.content.rename(obj=state[index], new_id='renamed-{}'.format(index))
+
+
+@benchmark('content.copy', setup=_documents)
+def content_copy(portal, index, state):
+    api.content.copy(source=state[index], target=portal['folder-0'])
+
+
+@benchmark('content.move_many', setup=_new_folders, number=5)
+def content_move_many(portal, index, state):
+    api.content.move_many(sources=state[index], target=portal)
+
+
+@benchmark('content.copy_many', number=5)
+def content_copy_many(portal, index, state):
+    api.content.copy_many(
+        sources=[_document(number) for number in range(FOLDER_SIZE)],
+        target=portal,
+    )
+
+
+@benchmark('content.delete', setup=_new_documents)
+def content_delete(portal, index, state):
+    api.content.delete(obj=state[index])
+
+
+@benchmark('content.find_breaches', number=20)
+def content_find_breaches(portal, index, state):
+    list(api.content.find_breaches(objects=[portal['folder-0']]))
+
+
+@benchmark('content.get_state', setup=_documents)
+def content_get_state(portal, index, state):
+    api.content.get_state(obj=state[index])
+
+
+@benchmark('content.transition', setup=_new_documents)
+def content_transition(portal, index, state):
+    api.content.transition(obj=state[index], to_state='published')
+
+
+@benchmark('content.transition_many', setup=_new_documents, number=1)
+def content_transition_many(portal, index, state):
+    api.content.transition_many(objects=state, to_state='published')
+
+
+@benchmark('content.disable_roles_acquisition', setup=_documents)
+def content_disable_roles_acquisition(portal, index, state):
+    api.content.disable_roles_acquisition(obj=state[index])
+
+
+@benchmark('content.enable_roles_acquisition', setup=_documents)
+def content_enable_roles_acquisition(portal, index, state):
+    api.content.enable_roles_acquisition(obj=state[index])
+
+
+@benchmark('content.get_view', setup=_documents)
+def content_get_view(portal, index, state):
+    api.content.get_view(
+        name='plone_context_state',
+        context=state[index],
+        request=portal.REQUEST,
+    )
+
+
+@benchmark('content.get_uuid', setup=_documents)
+def content_get_uuid(portal, index, state):
+    api.content.get_uuid(obj=state[index])
+
+
+@benchmark('content.find', number=20)
+def content_find(portal, index, state):
+    len(api.content.find(portal_type='Document'))
+
+
+@benchmark('content.find_iter', number=5)
+def content_find_iter(portal, index, state):
+    for obj in api.content.find_iter(
+        portal_type='Document',
+        objects=True,
+        deactivate=True,
+    ):
+        pass
+
+
+@benchmark('content.explain')
+def content_explain(portal, index, state):
+    api.content.explain(portal_type='Document', review_state='published')
+
+
+# env
+
+@benchmark('env.adopt_user')
+def env_adopt_user(portal, index, state):
+    with api.env.adopt_user(username=_user(index % SIZE)):
+        pass
+
+
+def _user_cache(portal, number):
+    api.env.enable_user_cache()
+
+
+@benchmark('env.enable_user_cache', number=1000)
+def env_enable_user_cache(portal, index, state):
+    api.env.enable_user_cache()
+
+
+@benchmark('env.adopt_user(cached)', setup=_user_cache)
+def env_adopt_user_cached(portal, index, state):
+    with api.env.adopt_user(username=_user(index % 10)):
+        pass
+
+
+@benchmark('env.invalidate_user_cache', setup=_user_cache)
+def env_invalidate_user_cache(portal, index, state):
+    api.env.invalidate_user_cache(username=_user(index % 10))
+
+
+@benchmark('env.disable_user_cache', number=1000)
+def env_disable_user_cache(portal, index, state):
+    api.env.disable_user_cache()
+
+
+@benchmark('env.adopt_roles')
+def env_adopt_roles(portal, index, state):
+    with api.env.adopt_roles(['Manager']):
+        pass
+
+
+@benchmark('env.debug_mode')
+def env_debug_mode(portal, index, state):
+    api.env.debug_mode()
+
+
+@benchmark('env.test_mode')
+def env_test_mode(portal, index, state):
+    api.env.test_mode()
+
+
+@benchmark('env.set_test_mode')
+def env_set_test_mode(portal, index, state):
+    api.env.set_test_mode(True)
+
+
+@benchmark('env.read_only_mode')
+def env_read_only_mode(portal, index, state):
+    api.env.read_only_mode()
+
+
+@benchmark('env.plone_version')
+def env_plone_version(portal, index, state):
+    api.env.plone_version()
+
+
+@benchmark('env.zope_version')
+def env_zope_version(portal, index, state):
+    api.env.zope_version()
+
+
+# group
+
+@benchmark('group.create')
+def group_create(portal, index, state):
+    api.group.create(groupname='created-{}'.format(index))
+
+
+@benchmark('group.get')
+def group_get(portal, index, state):
+    api.group.get(groupname='benchmarkers')
+
+
+@benchmark('group.get_groups')
+def group_get_groups(portal, index, state):
+    api.group.get_groups(username=_user(index % SIZE))
+
+
+@benchmark('group.delete', setup=_new_groups)
+def group_delete(portal, index, state):
+    api.group.delete(group=state[index])
+
+
+@benchmark('group.add_user')
+def group_add_user(portal, index, state):
+    api.group.add_user(groupname='benchmarkers', username=_user(index % SIZE))
+
+
+@benchmark('group.remove_user')
+def group_remove_user(portal, index, state):
+    api.group.remove_user(
+        groupname='benchmarkers',
+        username=_user(index % SIZE),
+    )
+
+
+@benchmark('group.get_roles', setup=_documents)
+def group_get_roles(portal, index, state):
+    api.group.get_roles(groupname='benchmarkers', obj=state[index])
+
+
+@benchmark('group.grant_roles', setup=_documents)
+def group_grant_roles(portal, index, state):
+    api.group.grant_roles(
+        groupname='benchmarkers',
+        roles=['Editor'],
+        obj=state[index],
+    )
+
+
+@benchmark('group.revoke_roles', setup=_documents)
+def group_revoke_roles(portal, index, state):
+    api.group.revoke_roles(
+        groupname='benchmarkers',
+        roles=['Editor'],
+        obj=state[index],
+    )
+
+
+# portal
+
+@benchmark('portal.get', number=1000)
+def portal_get(portal, index, state):
+    api.portal.get()
+
+
+@benchmark('portal.enable_lookup_cache', number=1000)
+def portal_enable_lookup_cache(portal, index, state):
+    api.portal.enable_lookup_cache()
+
+
+@benchmark('portal.disable_lookup_cache', number=1000)
+def portal_disable_lookup_cache(portal, index, state):
+    api.portal.disable_lookup_cache()
+
+
+@benchmark('portal.get_navigation_root', setup=_documents)
+def portal_get_navigation_root(portal, index, state):
+    api.portal.get_navigation_root(context=state[index])
+
+
+@benchmark('portal.get_tool', number=1000)
+def portal_get_tool(portal, index, state):
+    api.portal.get_tool('portal_catalog')
+
+
+@benchmark('portal.send_email', setup=_mailhost)
+def portal_send_email(portal, index, state):
+    api.portal.send_email(
+        recipient='recipient@example.org',
+        subject='Benchmark',
+        body='Benchmark',
+    )
+
+
+@benchmark('portal.get_localized_time')
+def portal_get_localized_time(portal, index, state):
+    api.portal.get_localized_time(datetime=portal.created())
+
+
+@benchmark('portal.show_message')
+def portal_show_message(portal, index, state):
+    api.portal.show_message(message='Benchmark', request=portal.REQUEST)
+
+
+@benchmark('portal.get_registry_record', number=1000)
+def portal_get_registry_record(portal, index, state):
+    api.portal.get_registry_record('plone.email_from_name')
+
+
+@benchmark('portal.get_registry_records', number=1000)
+def portal_get_registry_records(portal, index, state):
+    api.portal.get_registry_records(
+        names=[
+            'plone.email_charset',
+            'plone.email_from_address',
+            'plone.email_from_name',
+        ],
+    )
+
+
+@benchmark('portal.set_registry_record')
+def portal_set_registry_record(portal, index, state):
+    api.portal.set_registry_record(
+        'plone.email_from_name',
+        'Benchmark {}'.format(index),
+    )
+
+
+@benchmark('portal.get_default_language')
+def portal_get_default_language(portal, index, state):
+    api.portal.get_default_language()
+
+
+@benchmark('portal.get_current_language')
+def portal_get_current_language(portal, index, state):
+    api.portal.get_current_language()
+
+
+@benchmark('portal.translate')
+def portal_translate(portal, index, state):
+    api.portal.translate('Home', lang='de')
+
+
+# relation
+
+@benchmark('relation.get', setup=_documents)
+def relation_get(portal, index, state):
+    api.relation.get(source=state[index], relationship='link')
+
+
+@benchmark('relation.create', setup=_documents)
+def relation_create(portal, index, state):
+    api.relation.create(
+        source=state[index],
+        target=portal['folder-0'],
+        relationship='benchmark',
+    )
+
+
+@benchmark('relation.delete', setup=_documents)
+def relation_delete(portal, index, state):
+    api.relation.delete(source=state[index], relationship='link')
+
+
+# user
+
+@benchmark('user.create')
+def user_create(portal, index, state):
+    api.user.create(
+        username='created-{}'.format(index),
+        email='created-{}@example.org'.format(index),
+    )
+
+
+@benchmark('user.get', number=1000)
+def user_get(portal, index, state):
+    api.user.get(username=_user(index % SIZE))
+
+
+@benchmark('user.get_current', number=1000)
+def user_get_current(portal, index, state):
+    api.user.get_current()
+
+
+@benchmark('user.get_users', number=5)
+def user_get_users(portal, index, state):
+    api.user.get_users()
+
+
+@benchmark('user.get_users_iter', number=10)
+def user_get_users_iter(portal, index, state):
+    for user in api.user.get_users_iter(start=index * 10, batch_size=10):
+        pass
+
+
+@benchmark('user.delete', setup=_new_users)
+def user_delete(portal, index, state):
+    api.user.delete(user=state[index])
+
+
+@benchmark('user.is_anonymous', number=1000)
+def user_is_anonymous(portal, index, state):
+    api.user.is_anonymous()
+
+
+@benchmark('user.get_roles', setup=_documents)
+def user_get_roles(portal, index, state):
+    api.user.get_roles(username=_user(index % SIZE), obj=state[index])
+
+
+@benchmark('user.get_permissions', setup=_documents, number=20)
+def user_get_permissions(portal, index, state):
+    api.user.get_permissions(username=_user(index % SIZE), obj=state[index])
+
+
+@benchmark('user.get_permissions(permissions)', setup=_documents)
+def user_get_permissions_filtered(portal, index, state):
+    api.user.get_permissions(
+        username=_user(index % SIZE),
+        obj=state[index],
+        permissions=['View', 'Modify portal content', 'Delete objects'],
+    )
+
+
+@benchmark('user.get_permission_matrix', setup=_documents, number=5)
+def user_get_permission_matrix(portal, index, state):
+    api.user.get_permission_matrix(
+        usernames=[_user(i) for i in range(index, SIZE, 10)],
+        objs=state,
+        permissions=['View', 'Modify portal content', 'Delete objects'],
+    )
+
+
+@benchmark('user.has_permission', setup=_documents)
+def user_has_permission(portal, index, state):
+    api.user.has_permission(
+        'View',
+        username=_user(index % SIZE),
+        obj=state[index],
+    )
+
+
+@benchmark('user.grant_roles', setup=_documents)
+def user_grant_roles(portal, index, state):
+    api.user.grant_roles(
+        username=_user(index % SIZE),
+        roles=['Editor'],
+        obj=state[index],
+    )
+
+
+@benchmark('user.revoke_roles', setup=_documents)
+def user_revoke_roles(portal, index, state):
+    api.user.revoke_roles(
+        username=_user(index % SIZE),
+        roles=['Editor'],
+        obj=state[index],
+    )
+
+
+# import
+
+
+@benchmark('import plone.api', number=5)
+def import_plone_api(portal, index, state):
+    """Import plone.api in a fresh interpreter."""
+    subprocess.run(
+        [sys.executable, '-c', 'import plone.api'],
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+
+
+@benchmark('import plone.api.content', number=5)
+def import_plone_api_content(portal, index, state):
+    subprocess.run(
+        [sys.executable, '-c', 'import plone.api.content'],
+        check=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    )
+
+
+def public_functions():
+    """Return the names of all public plone.api functions."""
+    names = []
+    for module_name in MODULES:
+        module = getattr(api, module_name)
+        for name, value in inspect.getmembers(module, inspect.isfunction):
+            if not name.startswith('_') and value.__module__ == module.__name__:
+                names.append('{}.{}'.format(module_name, name))
+    return names
+
+
+def run(portal):
+    """Run all benchmarks and return their timings in seconds per call."""
+    results = OrderedDict()
+    for name, (func, setup, number) in BENCHMARKS.items():
+        state = setup(portal, number) if setup is not None else None
+        timings = []
+        for index in range(number):
+            start = time.perf_counter()
+            func(portal, index, state)
+            timings.append(time.perf_counter() - start)
+        results[name] = {
+            'number': number,
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance=TOLERANCE):
+    """Return the benchmarks whose median got slower than ``baseline``.
+
+    :returns: Mapping of benchmark name to (baseline, current) medians.
+    :rtype: dict
+    """
+    regressions = OrderedDict()
+    for name, result in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        if result['median'] > previous['median'] * (1 + tolerance):
+            regressions[name] = (previous['median'], result['median'])
+    return regressions
+
+
+class TestBenchmarks(unittest.TestCase):
+    """Time the public plone.api functions."""
+
+    layer = BENCHMARK_TESTING
+
+    def setUp(self):
+        self.portal = self.layer['portal']
+
+    def test_all_public_functions_have_a_benchmark(self):
+        missing = set(public_functions()) - set(BENCHMARKS)
+        self.assertFalse(
+            missing,
+            'No benchmark for: {}'.format(', '.join(sorted(missing))),
+        )
+
+    def test_benchmarks(self):
+        results = run(self.portal)
+        with open(OUTPUT, 'w') as output:
+            json.dump(
+                {
+                    'size': SIZE,
+                    'plone_version': api.env.plone_version(),
+                    'results': results,
+                },
+                output,
+                indent=2,
+            )
+
+        if not BASELINE:
+            return
+        with open(BASELINE) as baseline:
+            regressions = compare(results, json.load(baseline)['results'])
+        self.assertFalse(
+            regressions,
+            'Slower than the baseline:\n{}'.format(
+                '\n'.join(
+                    '{}: {:.6f}s -> {:.6f}s'.format(name, before, after)
+                    for name, (before, after) in regressions.items()
+                ),
+            ),
+        )
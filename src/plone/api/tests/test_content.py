@@ -429,6 +429,140 @@ class TestPloneApiContent(unittest.TestCase):
         self.assertEqual(results[0].start, today)
         self.assertEqual(results[0].end, tomorrow)
 
+    def test_create_many_constraints(self):
+        """Test the constraints when creating many content items."""
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+
+        # items are required
+        with self.assertRaises(MissingParameterError):
+            api.content.create_many(container=self.portal)
+
+        # each item needs a container and a type
+        with self.assertRaises(MissingParameterError):
+            api.content.create_many(items=[{'type': 'Document', 'id': 'a'}])
+
+        with self.assertRaises(MissingParameterError):
+            api.content.create_many(container=self.portal, items=[{'id': 'a'}])
+
+        # and an id or a title
+        with self.assertRaises(MissingParameterError):
+            api.content.create_many(
+                container=self.portal,
+                items=[{'type': 'Document'}],
+            )
+
+        # the type must be addable to the container
+        with self.assertRaises(InvalidParameterError) as cm:
+            api.content.create_many(
+                container=self.portal,
+                items=[{'type': 'foo', 'id': 'test-foo'}],
+            )
+        self.assertTrue(
+            str(cm.exception).startswith(
+                "Cannot add a 'foo' object to the container.",
+            ),
+        )
+
+    def test_create_many(self):
+        """Test creating many content items at once."""
+        folder = api.content.create(
+            container=self.portal,
+            type='Folder',
+            id='test-folder',
+        )
+        items = api.content.create_many(
+            container=folder,
+            items=[
+                {'type': 'Document', 'title': 'Test page'},
+                {'type': 'Document', 'id': 'other-page', 'title': 'Other'},
+                {'type': 'Document', 'title': 'Test page'},
+                {
+                    'type': 'Event',
+                    'id': 'event',
+                    'container': self.events,
+                    'description': 'An event',
+                },
+            ],
+        )
+
+        self.assertEqual(
+            [item.getId() for item in items],
+            ['test-page', 'other-page', 'test-page-1', 'event'],
+        )
+        self.assertEqual(items[0].aq_parent, folder)
+        self.assertEqual(items[0].Title(), 'Test page')
+        self.assertEqual(items[1].Title(), 'Other')
+        self.assertEqual(items[3].aq_parent, self.events)
+        self.assertEqual(items[3].portal_type, 'Event')
+        self.assertEqual(items[3].Description(), 'An event')
+        self.assertEqual(
+            len(api.content.find(context=folder, portal_type='Document')),
+            3,
+        )
+        self.verify_intids()
+
+    def test_create_many_safe_id(self):
+        """Test creating many content items with conflicting ids."""
+        with self.assertRaises(BadRequest):
+            api.content.create_many(
+                container=self.about,
+                items=[{'type': 'Document', 'id': 'team'}],
+            )
+
+        items = api.content.create_many(
+            container=self.about,
+            items=[
+                {'type': 'Document', 'id': 'team'},
+                {'type': 'Document', 'id': 'team'},
+            ],
+            safe_id=True,
+        )
+        self.assertEqual(
+            [item.getId() for item in items],
+            ['team-1', 'team-2'],
+        )
+
+    def test_create_many_not_dexterity(self):
+        """Test that types that are not Dexterity types are created with
+        their factory.
+        """
+        with mock.patch(
+            'plone.api.content.IDexterityFTI',
+        ) as IDexterityFTI, mock.patch(
+            'plone.api.content.createContent',
+        ) as createContent:
+            IDexterityFTI.providedBy.return_value = False
+            items = api.content.create_many(
+                container=self.about,
+                items=[
+                    {'type': 'Document', 'title': 'Test page'},
+                    {'type': 'Document', 'id': 'team', 'title': 'Team'},
+                ],
+                safe_id=True,
+            )
+        self.assertFalse(createContent.called)
+        self.assertEqual(
+            [item.getId() for item in items],
+            ['test-page', 'team-1'],
+        )
+        self.assertEqual(items[1].Title(), 'Team')
+
+    @mock.patch('plone.api.content.transaction.savepoint')
+    @mock.patch('plone.api.content.processQueue')
+    def test_create_many_batches(self, processQueue, savepoint):
+        """Test that indexing and savepoints happen once per batch."""
+        api.content.create_many(
+            container=self.portal,
+            items=[
+                {'type': 'Document', 'title': 'Page {}'.format(index)}
+                for index in range(5)
+            ],
+            batch_size=2,
+        )
+        self.assertEqual(savepoint.call_count, 2)
+        self.assertEqual(processQueue.call_count, 3)
+
     def test_get_constraints(self):
         """Test the constraints when content is fetched with get."""
 
@@ -473,6 +607,158 @@ class TestPloneApiContent(unittest.TestCase):
         # Test getting a non-existing subfolder by path
         self.assertFalse(api.content.get('/about/spam'))
 
+    def test_path_cache(self):
+        """Test caching the objects found by path."""
+        api.content.enable_path_cache(maxsize=2)
+        self.addCleanup(api.content.disable_path_cache)
+        self.addCleanup(api.portal.disable_lookup_cache)
+
+        traverse = self.portal.restrictedTraverse
+        with mock.patch.object(
+            type(self.portal),
+            'restrictedTraverse',
+            side_effect=traverse,
+        ) as restrictedTraverse:
+            self.assertEqual(api.content.get('/about/team'), self.team)
+            self.assertEqual(api.content.get('/about/team'), self.team)
+            self.assertIsNone(api.content.get('/spam/ham'))
+            self.assertIsNone(api.content.get('/spam/ham'))
+            self.assertEqual(restrictedTraverse.call_count, 2)
+
+            # The least recently used path is dropped
+            api.content.get('/about/contact')
+            api.content.get('/about/team')
+            self.assertEqual(restrictedTraverse.call_count, 3)
+            api.content.get('/spam/ham')
+            self.assertEqual(restrictedTraverse.call_count, 4)
+
+            api.content.disable_path_cache()
+            api.content.get('/about/team')
+            api.content.get('/about/team')
+            self.assertEqual(restrictedTraverse.call_count, 6)
+
+    def test_path_cache_without_subscribers(self):
+        """Test that the path cache is not enabled without its subscribers."""
+        self.addCleanup(api.portal.disable_lookup_cache)
+        with mock.patch(
+            'plone.api.content._path_cache_subscribers_registered',
+            return_value=False,
+        ):
+            with self.assertWarns(RuntimeWarning):
+                api.content.enable_path_cache()
+        from plone.api.content import _get_path_cache
+        self.assertIsNone(_get_path_cache())
+
+        from plone.api.content import _path_cache_subscribers_registered
+        self.assertTrue(_path_cache_subscribers_registered())
+
+    def test_path_cache_security(self):
+        """Test that cached objects are only found by the same user."""
+        from AccessControl import Unauthorized
+        api.content.enable_path_cache()
+        self.addCleanup(api.content.disable_path_cache)
+        self.addCleanup(api.portal.disable_lookup_cache)
+
+        self.assertEqual(api.content.get('/about/team'), self.team)
+        with api.env.adopt_roles(['Anonymous']):
+            with self.assertRaises(Unauthorized):
+                api.content.get('/about/team')
+        self.assertEqual(api.content.get('/about/team'), self.team)
+
+    def test_path_cache_invalidation(self):
+        """Test that the path cache is cleared when content moves."""
+        api.content.enable_path_cache()
+        self.addCleanup(api.content.disable_path_cache)
+        self.addCleanup(api.portal.disable_lookup_cache)
+
+        self.assertEqual(api.content.get('/about/team'), self.team)
+        self.assertIsNone(api.content.get('/events/team'))
+        api.content.move(source=self.team, target=self.events)
+        self.assertIsNone(api.content.get('/about/team'))
+        self.assertEqual(
+            api.content.get('/events/team'),
+            self.events['team'],
+        )
+
+        api.content.rename(obj=self.events['team'], new_id='crew')
+        self.assertIsNone(api.content.get('/events/team'))
+
+        api.content.delete(obj=self.contact)
+        self.assertIsNone(api.content.get('/about/contact'))
+
+    def test_path_cache_local_roles(self):
+        """Test that the path cache is cleared when local roles change."""
+        from AccessControl import Unauthorized
+        api.user.create(email='bob@plone.org', username='bob')
+        api.user.grant_roles(username='bob', obj=self.about, roles=['Reader'])
+        api.content.enable_path_cache()
+        self.addCleanup(api.content.disable_path_cache)
+        self.addCleanup(api.portal.disable_lookup_cache)
+
+        with api.env.adopt_user(username='bob'):
+            self.assertEqual(api.content.get('/about/team'), self.team)
+            api.user.revoke_roles(
+                username='bob',
+                obj=self.about,
+                roles=['Reader'],
+            )
+            with self.assertRaises(Unauthorized):
+                api.content.get('/about/team')
+
+    def test_get_many_constraints(self):
+        """Test the constraints when getting many objects."""
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+
+        with self.assertRaises(MissingParameterError):
+            api.content.get_many()
+
+        with self.assertRaises(InvalidParameterError):
+            api.content.get_many(paths=['/about'], UIDs=[self.about.UID()])
+
+    def test_get_many(self):
+        """Test getting many objects at once."""
+        uids = [self.team.UID(), 'bacon', self.about.UID()]
+        result = api.content.get_many(UIDs=uids)
+        self.assertEqual(list(result), uids)
+        self.assertEqual(list(result.values()), [self.team, None, self.about])
+
+        paths = [
+            '/about/team',
+            '/spam/ham',
+            '/{}/events'.format(self.portal.getId()),
+            '/portal_catalog',
+        ]
+        result = api.content.get_many(paths=paths)
+        self.assertEqual(list(result), paths)
+        self.assertEqual(
+            list(result.values()),
+            [
+                self.team,
+                None,
+                self.events,
+                api.portal.get_tool('portal_catalog'),
+            ],
+        )
+
+        # The catalog is queried once
+        catalog = api.portal.get_tool('portal_catalog')
+        with mock.patch.object(
+            type(catalog),
+            'unrestrictedSearchResults',
+            side_effect=catalog.unrestrictedSearchResults,
+        ) as search:
+            api.content.get_many(UIDs=uids)
+        self.assertEqual(search.call_count, 1)
+
+    def test_get_many_forbidden(self):
+        """Test that objects the user may not access are None."""
+        uids = [self.team.UID(), self.blog.UID()]
+        api.content.transition(obj=self.blog, transition='publish')
+        with api.env.adopt_roles(['Anonymous']):
+            result = api.content.get_many(UIDs=uids)
+        self.assertEqual(list(result.values()), [None, self.blog])
+
     def test_move_constraints(self):
         """Test the constraints for moving content."""
         from plone.api.exc import MissingParameterError
@@ -782,6 +1068,138 @@ class TestPloneApiContent(unittest.TestCase):
         # Using safe_id=True should work
         api.content.copy(obj, obj.__parent__, obj.id, safe_id=True)
 
+    def test_move_many(self):
+        """Test moving many objects at once."""
+        team_uid = self.team.UID()
+        moved = api.content.move_many(
+            sources=[self.team, self.contact, self.blog],
+            target=self.events,
+            ids=[None, 'contact-us', 'blog'],
+        )
+        self.assertEqual(
+            [obj.getId() for obj in moved],
+            ['team', 'contact-us', 'blog'],
+        )
+        self.assertEqual(list(self.about.keys()), [])
+        self.assertNotIn('blog', self.portal)
+        self.assertEqual(moved[0].UID(), team_uid)
+        self.assertEqual(aq_base(self.events['team']), aq_base(self.team))
+
+        # The moved objects are reindexed right away
+        brain = api.content.find(UID=team_uid)[0]
+        self.assertEqual(
+            brain.getPath(),
+            '/'.join(self.events.getPhysicalPath()) + '/team',
+        )
+
+        # Moving within the same container renames
+        moved = api.content.move_many(
+            sources=[self.events['team'], self.training],
+            target=self.events,
+            ids=['crew', None],
+        )
+        self.assertEqual(
+            [obj.getId() for obj in moved],
+            ['crew', 'training'],
+        )
+        self.assertNotIn('team', self.events)
+
+    def test_move_many_notifies_containers_once(self):
+        """Test that containers are marked as modified once."""
+        with mock.patch(
+            'plone.api.content.notifyContainerModified',
+        ) as notifyContainerModified:
+            api.content.move_many(
+                sources=[self.team, self.contact, self.training],
+                target=self.portal,
+            )
+        self.assertEqual(
+            [call[0][0] for call in notifyContainerModified.call_args_list],
+            [self.about, self.events, self.portal],
+        )
+
+    def test_move_many_constraints(self):
+        """Test the constraints for moving many objects."""
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+        with self.assertRaises(MissingParameterError):
+            api.content.move_many(sources=[self.team])
+
+        with self.assertRaises(InvalidParameterError):
+            api.content.move_many(
+                sources=[self.about, self.team],
+                target=self.events,
+            )
+
+        with self.assertRaises(InvalidParameterError):
+            api.content.move_many(
+                sources=[self.team, self.contact],
+                target=self.events,
+                ids=['crew'],
+            )
+
+        with self.assertRaises(InvalidParameterError):
+            api.content.move_many(
+                sources=[self.team],
+                target=self.events,
+                ids=['training'],
+            )
+        self.assertIn('team', self.about)
+
+        moved = api.content.move_many(
+            sources=[self.team],
+            target=self.events,
+            ids=['training'],
+            safe_id=True,
+        )
+        self.assertNotEqual(moved[0].getId(), 'training')
+        self.assertIn('training', self.events)
+
+    def test_copy_many(self):
+        """Test copying many objects at once."""
+        copies = api.content.copy_many(
+            sources=[self.team, self.contact, self.about],
+            target=self.events,
+            ids=['team-copy', None, None],
+        )
+        self.assertEqual(
+            [obj.getId() for obj in copies],
+            ['team-copy', 'contact', 'about'],
+        )
+        self.assertIn('team', self.about)
+        self.assertIn('contact', self.about)
+        self.assertEqual(
+            list(self.events['about'].keys()),
+            ['team', 'contact'],
+        )
+        self.assertNotEqual(copies[0].UID(), self.team.UID())
+        self.assertEqual(
+            len(api.content.find(context=self.events, portal_type='Document')),
+            4,
+        )
+
+        # Copies in the same container get a prefix
+        copies = api.content.copy_many(
+            sources=[self.team],
+            target=self.about,
+        )
+        self.assertEqual(copies[0].getId(), 'copy_of_team')
+
+        from plone.api.exc import InvalidParameterError
+        with self.assertRaises(InvalidParameterError):
+            api.content.copy_many(
+                sources=[self.team],
+                target=self.about,
+                ids=['contact'],
+            )
+        copies = api.content.copy_many(
+            sources=[self.team],
+            target=self.about,
+            ids=['contact'],
+            safe_id=True,
+        )
+        self.assertNotIn(copies[0].getId(), ('contact', 'team'))
+
     def test_delete_constraints(self):
         """Test the constraints for deleting content."""
 
@@ -820,6 +1238,42 @@ class TestPloneApiContent(unittest.TestCase):
         self.assertNotIn('copy_of_about', container)
         self.assertNotIn('about', container['events'])
 
+    def test_delete_multiple_grouped_by_container(self):
+        """Test that objects are deleted once per container."""
+        from plone.dexterity.content import Container
+        with mock.patch.object(
+            Container,
+            'manage_delObjects',
+            autospec=True,
+        ) as manage_delObjects:
+            api.content.delete(
+                objects=[
+                    self.team,
+                    self.training,
+                    self.contact,
+                    self.sprint,
+                    self.team,
+                ],
+                check_linkintegrity=False,
+            )
+        self.assertEqual(
+            manage_delObjects.call_args_list,
+            [
+                mock.call(self.about, ['team', 'contact']),
+                mock.call(self.events, ['training', 'sprint']),
+            ],
+        )
+
+    def test_delete_multiple_nested(self):
+        """Test deleting a folder together with its contents."""
+        path = '/'.join(self.about.getPhysicalPath())
+        api.content.delete(
+            objects=[self.team, self.about, self.contact],
+            check_linkintegrity=False,
+        )
+        self.assertNotIn('about', self.portal)
+        self.assertFalse(api.content.find(path=path))
+
     def test_delete_no_objs(self):
         # Check that we allow passing in an empty list of objects.
         api.content.delete(obj=None, objects=[])
@@ -882,6 +1336,96 @@ class TestPloneApiContent(unittest.TestCase):
         self.assertNotIn('blog', self.portal.keys())
         self.assertNotIn('training', self.portal['events'].keys())
 
+    def test_delete_check_linkintegrity_related_items(self):
+        """Test that relations other than links in text are breaches too."""
+        api.relation.create(
+            source=self.team,
+            target=self.contact,
+            relationship='relatedItems',
+        )
+        with self.assertRaises(LinkIntegrityNotificationException):
+            api.content.delete(self.contact)
+        self.assertIn('contact', self.portal['about'].keys())
+
+    def test_delete_check_linkintegrity_without_view(self):
+        """Test that breaches are found without the confirmation view."""
+        self._set_text(self.team, '<a href="contact">contact</a>')
+        with mock.patch('plone.api.content.get_view') as get_view:
+            with self.assertRaises(LinkIntegrityNotificationException):
+                api.content.delete(self.contact)
+        self.assertFalse(get_view.called)
+
+    def test_find_breaches(self):
+        """Test finding the breaches that deleting content would cause."""
+        self._set_text(self.team, '<a href="contact">contact</a>')
+        self._set_text(self.training, '<a href="../blog">blog</a>')
+
+        breaches = list(api.content.find_breaches(objects=[self.contact]))
+        self.assertEqual(len(breaches), 1)
+        self.assertEqual(breaches[0]['target']['uid'], self.contact.UID())
+        self.assertEqual(
+            [source['uid'] for source in breaches[0]['sources']],
+            [self.team.UID()],
+        )
+        self.assertTrue(breaches[0]['sources'][0]['accessible'])
+        self.assertEqual(breaches[0]['target']['portal_type'], 'Document')
+        self.assertEqual(breaches[0]['target']['type_title'], 'Page')
+
+        # Links from content that is deleted as well are no breaches
+        self.assertEqual(
+            list(api.content.find_breaches(objects=[self.about])),
+            [],
+        )
+        self.assertEqual(
+            list(
+                api.content.find_breaches(objects=[self.team, self.contact]),
+            ),
+            [],
+        )
+
+        # Content inside the deleted objects is checked too
+        breaches = list(
+            api.content.find_breaches(objects=[self.about, self.blog]),
+        )
+        self.assertEqual(
+            [breach['target']['uid'] for breach in breaches],
+            [self.blog.UID()],
+        )
+
+    def test_find_breaches_batches(self):
+        """Test that breaches are found batch by batch."""
+        from zc.relation.interfaces import ICatalog
+        from zope.component import getUtility
+        self._set_text(self.team, '<a href="contact">contact</a>')
+        self._set_text(self.training, '<a href="../about/team">team</a>')
+        relation_catalog = getUtility(ICatalog)
+
+        with mock.patch.object(
+            type(relation_catalog),
+            'findRelations',
+            autospec=True,
+            side_effect=type(relation_catalog).findRelations,
+        ) as findRelations:
+            breaches = api.content.find_breaches(
+                objects=[self.team, self.contact, self.sprint],
+                batch_size=1,
+            )
+            self.assertEqual(
+                next(breaches)['target']['uid'],
+                self.team.UID(),
+            )
+            # Stopping at the first breach skips the other batches
+            self.assertEqual(findRelations.call_count, 1)
+            self.assertEqual(len(list(breaches)), 0)
+            self.assertEqual(findRelations.call_count, 3)
+
+    def test_find_breaches_constraints(self):
+        """Test the constraints for finding breaches."""
+        from plone.api.exc import MissingParameterError
+        with self.assertRaises(MissingParameterError):
+            api.content.find_breaches()
+        self.assertEqual(list(api.content.find_breaches(objects=[])), [])
+
     def _set_text(self, obj, text):
         obj.text = RichTextValue(text, 'text/html', 'text/x-html-safe')
         modified(obj)
@@ -1109,6 +1653,125 @@ class TestPloneApiContent(unittest.TestCase):
         documents = api.content.find(**query)
         self.assertEqual(len(documents), 0)
 
+    def test_find_iter(self):
+        """Test iterating over search results in batches."""
+        expected = [
+            brain.getPath()
+            for brain in api.content.find(portal_type='Event')
+        ]
+        self.assertEqual(len(expected), 3)
+
+        brains = api.content.find_iter(portal_type='Event', batch_size=2)
+        self.assertEqual([brain.getPath() for brain in brains], expected)
+
+        objects = api.content.find_iter(
+            portal_type='Event',
+            batch_size=2,
+            objects=True,
+        )
+        self.assertEqual(
+            ['/'.join(obj.getPhysicalPath()) for obj in objects],
+            expected,
+        )
+
+        # Don't dump the whole catalog
+        self.assertEqual(list(api.content.find_iter()), [])
+
+        from plone.api.exc import InvalidParameterError
+        with self.assertRaises(InvalidParameterError):
+            list(api.content.find_iter(portal_type='Event', batch_size=0))
+
+    def test_find_iter_deactivate(self):
+        """Test that the objects are deactivated per batch."""
+        import transaction
+        transaction.savepoint(optimistic=True)
+        connection = self.portal._p_jar
+
+        with mock.patch.object(connection, 'cacheGC') as cacheGC:
+            objects = list(api.content.find_iter(
+                portal_type='Event',
+                batch_size=2,
+                objects=True,
+                deactivate=True,
+            ))
+        self.assertEqual(len(objects), 3)
+        self.assertEqual(cacheGC.call_count, 2)
+
+    def test_explain(self):
+        """Test explaining a search."""
+        plan = api.content.explain(
+            context=self.events,
+            depth=1,
+            portal_type='Event',
+            getId=['training', 'sprint'],
+            object_provides=IContentish,
+            SearchableText='training',
+            sort_on='getId',
+        )
+        self.assertEqual(
+            plan['query']['path'],
+            {'query': '/'.join(self.events.getPhysicalPath()), 'depth': 1},
+        )
+        self.assertEqual(
+            plan['query']['object_provides'],
+            {'query': [IContentish.__identifier__], 'operator': 'or'},
+        )
+        catalog = api.portal.get_tool('portal_catalog')
+        self.assertEqual(plan['size'], len(catalog))
+        self.assertEqual(
+            [(step['index'], step['estimate']) for step in plan['plan'][:2]],
+            [('getId', 2), ('portal_type', 3)],
+        )
+        self.assertEqual(
+            {step['index'] for step in plan['plan'][2:]},
+            {'path', 'object_provides', 'SearchableText'},
+        )
+        self.assertEqual(
+            {step['estimate'] for step in plan['plan'][2:]},
+            {None},
+        )
+
+        # Without a valid index nothing is planned
+        self.assertEqual(api.content.explain(foo='bar')['plan'], [])
+
+    def test_explain_operators(self):
+        """Test the estimates of keyword queries."""
+        self.team.setSubject(['a', 'b'])
+        self.contact.setSubject(['a'])
+        self.team.reindexObject()
+        self.contact.reindexObject()
+
+        def estimate(query):
+            plan = api.content.explain(Subject=query)['plan']
+            return plan[0]['estimate']
+
+        self.assertEqual(estimate('a'), 2)
+        self.assertEqual(estimate({'query': ['a', 'b'], 'operator': 'or'}), 3)
+        self.assertEqual(estimate({'query': ['a', 'b'], 'operator': 'and'}), 1)
+        self.assertEqual(estimate({'query': ['a'], 'not': ['b']}), None)
+
+    def test_find_without_matches(self):
+        """Test that the catalog is not searched if an index of the query
+        cannot match anything.
+        """
+        catalog = api.portal.get_tool('portal_catalog')
+        with mock.patch.object(
+            type(catalog),
+            '__call__',
+            side_effect=catalog.searchResults,
+        ) as search:
+            self.assertEqual(
+                len(api.content.find(portal_type='Event', getId='nothing')),
+                0,
+            )
+            self.assertFalse(search.called)
+
+            self.assertEqual(
+                len(api.content.find(portal_type='Event', getId='sprint')),
+                1,
+            )
+            self.assertTrue(search.called)
+
     def test_find_parse_object_provides_query(self):
 
         parse = api.content._parse_object_provides_query
@@ -1263,6 +1926,152 @@ class TestPloneApiContent(unittest.TestCase):
             'internally_published',
         )
 
+    def test_transition_many(self):
+        """Test transitioning many content items."""
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+
+        with self.assertRaises(MissingParameterError):
+            api.content.transition_many(to_state='published')
+
+        with self.assertRaises(MissingParameterError):
+            api.content.transition_many(objects=[self.team])
+
+        with self.assertRaises(InvalidParameterError):
+            api.content.transition_many(
+                objects=[self.team],
+                transition='publish',
+                to_state='published',
+            )
+
+        results = api.content.transition_many(
+            objects=[self.team, self.contact, self.events],
+            to_state='published',
+            comment='Publish all',
+        )
+        self.assertEqual(
+            results,
+            [(self.team, None), (self.contact, None), (self.events, None)],
+        )
+        for obj in (self.team, self.contact, self.events):
+            self.assertEqual(api.content.get_state(obj=obj), 'published')
+        self.assertEqual(
+            len(api.content.find(
+                path='/'.join(self.about.getPhysicalPath()),
+                review_state='published',
+            )),
+            2,
+        )
+
+        # Failures are reported per object
+        results = api.content.transition_many(
+            objects=[self.team, self.blog],
+            transition='retract',
+        )
+        self.assertEqual(results[0], (self.team, None))
+        self.assertEqual(results[1][0], self.blog)
+        self.assertIsInstance(results[1][1], InvalidParameterError)
+        self.assertEqual(api.content.get_state(obj=self.team), 'private')
+
+    def test_transition_many_without_workflow(self):
+        """Test that objects without a workflow don't stop the others."""
+        from plone.api.exc import InvalidParameterError
+
+        results = api.content.transition_many(
+            objects=[self.team, self.image, self.contact],
+            to_state='published',
+        )
+        self.assertEqual(results[0], (self.team, None))
+        self.assertEqual(results[1][0], self.image)
+        self.assertIsInstance(results[1][1], WorkflowException)
+        self.assertEqual(results[2], (self.contact, None))
+        self.assertEqual(api.content.get_state(obj=self.contact), 'published')
+
+        results = api.content.transition_many(
+            objects=[self.image, self.team],
+            transition='retract',
+        )
+        self.assertIsInstance(results[0][1], InvalidParameterError)
+        self.assertEqual(results[1], (self.team, None))
+
+    def test_transition_many_looks_up_workflows_once(self):
+        """Test that the workflows of objects of the same type in the same
+        container are looked up once.
+        """
+        with mock.patch('plone.api.content._transition') as _transition:
+            api.content.transition_many(
+                objects=[self.team, self.contact, self.training],
+                to_state='published',
+            )
+        workflows = [call[0][5] for call in _transition.call_args_list]
+        self.assertIs(workflows[0], workflows[1])
+        self.assertIsNot(workflows[0], workflows[2])
+
+    def test_wf_transitions_for(self):
+        """Test finding the shortest path of transitions to a state."""
+        from plone.api.content import _wf_transitions_for
+        portal_workflow = api.portal.get_tool('portal_workflow')
+        workflow = portal_workflow['intranet_workflow']
+
+        # There is no direct transition
+        path = _wf_transitions_for(workflow, 'private', 'internally_published')
+        self.assertEqual(len(path), 2)
+        self.assertEqual(
+            _wf_transitions_for(workflow, 'private', 'private'),
+            [],
+        )
+        self.assertIsNone(
+            _wf_transitions_for(workflow, 'private', 'nonexistent'),
+        )
+
+        workflow = portal_workflow['simple_publication_workflow']
+        self.assertEqual(
+            _wf_transitions_for(workflow, 'private', 'published'),
+            ['publish'],
+        )
+
+    def test_wf_transitions_for_cached(self):
+        """Test that the transition graph and paths are cached until the
+        workflow definition changes.
+        """
+        from plone.api.content import _wf_transitions_for
+        portal_workflow = api.portal.get_tool('portal_workflow')
+        workflow = portal_workflow['simple_publication_workflow']
+
+        _wf_transitions_for(workflow, 'private', 'published')
+        with mock.patch(
+            'plone.api.content._find_path',
+        ) as _find_path, mock.patch(
+            'plone.api.content._workflow_fingerprint',
+        ) as _workflow_fingerprint:
+            self.assertEqual(
+                _wf_transitions_for(workflow, 'private', 'published'),
+                ['publish'],
+            )
+            self.assertFalse(_find_path.called)
+            # The definition is checked once per transaction
+            self.assertFalse(_workflow_fingerprint.called)
+
+        # Remove the direct transition from private to published
+        private = workflow.states['private']
+        private.transitions = tuple(
+            transition
+            for transition in private.transitions
+            if transition != 'publish'
+        )
+        # The change is picked up in the same transaction
+        self.assertEqual(
+            _wf_transitions_for(workflow, 'private', 'published'),
+            ['submit', 'publish'],
+        )
+
+        # and in the next one
+        with mock.patch('transaction.get', return_value=object()):
+            self.assertEqual(
+                _wf_transitions_for(workflow, 'private', 'published'),
+                ['submit', 'publish'],
+            )
+
     def test_diable_roles_acquisition(self):
         """ Test disabling local roles acquisition.
         """
@@ -1344,6 +2153,55 @@ class TestPloneApiContent(unittest.TestCase):
         self.assertEqual(view.__name__, 'plone_context_state')
         self.assertEqual(aq_base(view.canonical_object()), aq_base(self.blog))
 
+    def test_get_view_does_not_list_views(self):
+        """Test that available views are only listed if a view is missing."""
+        from zope.component import getSiteManager
+        request = self.layer['request']
+        adapters = getSiteManager().adapters
+        with mock.patch.object(
+            adapters,
+            'lookupAll',
+            side_effect=adapters.lookupAll,
+        ) as lookupAll:
+            api.content.get_view(
+                name='plone',
+                context=self.blog,
+                request=request,
+            )
+            self.assertFalse(lookupAll.called)
+
+    def test_get_view_lookup_cache(self):
+        """Test caching the view lookup."""
+        from zope.component import getSiteManager
+        request = self.layer['request']
+        api.portal.enable_lookup_cache()
+        self.addCleanup(api.portal.disable_lookup_cache)
+
+        with mock.patch(
+            'plone.api.content.getSiteManager',
+            side_effect=getSiteManager,
+        ) as getSiteManager_:
+            for context in (self.blog, self.team, self.blog, self.team):
+                view = api.content.get_view(
+                    name='plone_context_state',
+                    context=context,
+                    request=request,
+                )
+                self.assertEqual(
+                    aq_base(view.canonical_object()),
+                    aq_base(context),
+                )
+            # One lookup for the Link and one for the Document
+            self.assertEqual(getSiteManager_.call_count, 2)
+
+            api.portal.disable_lookup_cache()
+            api.content.get_view(
+                name='plone_context_state',
+                context=self.blog,
+                request=request,
+            )
+            self.assertEqual(getSiteManager_.call_count, 3)
+
     def test_get_uuid(self):
         """Test getting a content item's UUID."""
         from plone.api.exc import MissingParameterError
@@ -5,8 +5,11 @@ from OFS.SimpleItem import SimpleItem
 from plone import api
 from plone.api.tests.base import INTEGRATION_TESTING
 from plone.app.testing import TEST_USER_ID
+from unittest import mock
 
 import AccessControl
+import os
+import sys
 import unittest
 
 
@@ -421,12 +424,74 @@ class TestPloneApiEnv(unittest.TestCase):
         from plone.api.env import test_mode
         self.assertEqual(test_mode(), True)
 
+    def test_set_test_mode(self):
+        """Tests that test layers can set the test mode."""
+        from plone.api.env import set_test_mode
+        from plone.api.env import test_mode
+        self.addCleanup(set_test_mode, True)
+
+        set_test_mode(False)
+        self.assertFalse(test_mode())
+        set_test_mode(True)
+        self.assertTrue(test_mode())
+
+    def test_test_mode_detection(self):
+        """Tests detecting test mode when no layer set it."""
+        from plone.api.env import set_test_mode
+        from plone.api.env import test_mode
+        self.addCleanup(set_test_mode, True)
+
+        for value, expected in (('1', True), ('0', False), ('off', False)):
+            set_test_mode(None)
+            with mock.patch.dict(os.environ, {'PLONE_API_TEST_MODE': value}):
+                self.assertEqual(test_mode(), expected)
+            # The answer is cached
+            self.assertEqual(test_mode(), expected)
+
+        environ = dict(os.environ)
+        environ.pop('PLONE_API_TEST_MODE', None)
+        for loaded in (True, False):
+            modules = dict(sys.modules)
+            modules.pop('zope.testrunner', None)
+            if loaded:
+                modules['zope.testrunner'] = mock.Mock()
+            set_test_mode(None)
+            with mock.patch.dict(os.environ, environ, clear=True):
+                with mock.patch.dict(sys.modules, modules, clear=True):
+                    self.assertEqual(test_mode(), loaded)
+
     def test_read_only_mode(self):
         """Test that read_only_mode() returns False
         as we have a write enabled ZODB."""
         from plone.api.env import read_only_mode
         self.assertFalse(read_only_mode())
 
+    def test_read_only_mode_uses_current_connection(self):
+        """Test that read_only_mode() does not open a new connection."""
+        from plone.api.env import read_only_mode
+        connection = self.portal._p_jar
+        with mock.patch('Zope2.DB') as DB:
+            with mock.patch.object(
+                connection,
+                'isReadOnly',
+                return_value=True,
+            ):
+                self.assertTrue(read_only_mode())
+        self.assertFalse(DB.open.called)
+
+    def test_read_only_mode_without_site(self):
+        """Test that read_only_mode() asks the storage without a site."""
+        from plone.api.env import read_only_mode
+        from zope.component.hooks import getSite
+        from zope.component.hooks import setSite
+        site = getSite()
+        setSite(None)
+        self.addCleanup(setSite, site)
+        with mock.patch('Zope2.DB') as DB:
+            DB.storage.isReadOnly.return_value = True
+            self.assertTrue(read_only_mode())
+        self.assertFalse(DB.open.called)
+
     def test_plone_version(self):
         """Tests that plone_version() returns Plone version."""
         from plone.api.env import plone_version
@@ -439,7 +504,246 @@ class TestPloneApiEnv(unittest.TestCase):
         self.assertTrue(isinstance(zope_version(), str))
         self.assertRegexpMatches(zope_version(), version_regexp)
 
+    def test_versions_are_looked_up_once(self):
+        """Tests that versions are looked up once per process."""
+        from plone.api import env
+        env.plone_version()
+        with mock.patch('plone.api.env.distribution_version') as lookup:
+            self.assertIs(env.plone_version(), env.plone_version())
+        self.assertFalse(lookup.called)
+
+    def test_versions_compare_as_versions(self):
+        """Tests comparing versions with strings and tuples."""
+        from plone.api.env import plone_version
+        from plone.api.env import Version
+        version = plone_version()
+        self.assertIsInstance(version, Version)
+        self.assertGreaterEqual(version, '5.2')
+        self.assertGreater(version, (5, 2))
+        self.assertLess(version, '100')
+        self.assertGreaterEqual(version.release, (5, 2))
+        self.assertTrue(version.startswith(str(version.release[0])))
+
+        self.assertGreater(Version('10.0'), '9.3')
+        self.assertLessEqual(Version('6.0'), '6')
+        self.assertGreaterEqual(Version('6.0'), '6')
+        self.assertEqual(Version('6.0.1').release, (6, 0, 1))
+        self.assertLess(Version('6.0.dev1'), '6.0a1')
+        self.assertLess(Version('6.0a1'), '6.0b1')
+        self.assertLess(Version('6.0b1'), '6.0rc1')
+        self.assertLess(Version('6.0rc1'), '6.0')
+        self.assertLess(Version('6.0'), '6.0.post1')
+        self.assertLess(Version('6.0.13'), '6.1.0a1')
+        self.assertEqual(Version('6.0.1').upper(), '6.0.1')
+
+        # Equality and hashing are those of the string.
+        self.assertEqual(Version('6.0'), '6.0')
+        self.assertNotEqual(Version('6.0'), '6')
+        self.assertEqual(len({Version('6.0'), Version('6')}), 2)
+        self.assertEqual(hash(Version('6.0')), hash('6.0'))
+        self.assertNotEqual(Version('abc'), 'xyz')
+        self.assertLess(Version('abc'), 'xyz')
+
     def test_adopt_user_different_username(self):
         user = api.user.get(userid=TEST_USER_ID)
         with api.env.adopt_user(user=user):
             self.assertEqual(api.user.get_current().getId(), TEST_USER_ID)
+
+    def test_user_cache(self):
+        """Test that adopted users are looked up once while cached."""
+        acl_users = self.portal.acl_users
+        self.addCleanup(api.env.disable_user_cache)
+        api.env.enable_user_cache()
+
+        with mock.patch.object(
+            acl_users,
+            'getUser',
+            wraps=acl_users.getUser,
+        ) as getUser:
+            for _ in range(3):
+                with api.env.adopt_user(username='worker'):
+                    self.assertEqual(
+                        api.user.get_current().getId(),
+                        'worker',
+                    )
+                api.user.has_permission('View', username='worker')
+                api.user.get_permissions(username='worker', obj=self.portal)
+        self.assertEqual(getUser.call_count, 1)
+
+        api.env.disable_user_cache()
+        with mock.patch.object(
+            acl_users,
+            'getUser',
+            wraps=acl_users.getUser,
+        ) as getUser:
+            for _ in range(2):
+                with api.env.adopt_user(username='worker'):
+                    pass
+        self.assertEqual(getUser.call_count, 2)
+
+    def test_user_cache_ttl(self):
+        """Test that cached users expire."""
+        acl_users = self.portal.acl_users
+        self.addCleanup(api.env.disable_user_cache)
+        api.env.enable_user_cache(ttl=10)
+
+        with mock.patch.object(
+            acl_users,
+            'getUser',
+            wraps=acl_users.getUser,
+        ) as getUser, mock.patch('time.monotonic') as monotonic:
+            for now in (100, 105, 111, 115):
+                monotonic.return_value = now
+                api.env.adopt_user(username='worker')
+        self.assertEqual(getUser.call_count, 2)
+
+    def test_user_cache_invalidation(self):
+        """Test that changes to roles and groups drop cached users."""
+        self.addCleanup(api.env.disable_user_cache)
+        api.env.enable_user_cache()
+
+        self.assertFalse(
+            api.user.has_permission('Manage portal', username='worker'),
+        )
+        api.user.grant_roles(username='worker', roles=['Manager'])
+        self.assertTrue(
+            api.user.has_permission('Manage portal', username='worker'),
+        )
+
+        api.group.create(groupname='managers')
+        api.group.grant_roles(groupname='managers', roles=['Manager'])
+        self.assertFalse(
+            api.user.has_permission('Manage portal', username='boss'),
+        )
+        api.group.add_user(groupname='managers', username='boss')
+        self.assertTrue(
+            api.user.has_permission('Manage portal', username='boss'),
+        )
+
+        with api.env.adopt_user(username='superhuman'):
+            pass
+        api.user.delete(username='superhuman')
+        from plone.api.exc import UserNotFoundError
+        with self.assertRaises(UserNotFoundError):
+            api.env.adopt_user(username='superhuman')
+
+    def test_invalidate_user_cache(self):
+        """Test dropping users from the cache explicitly."""
+        acl_users = self.portal.acl_users
+        self.addCleanup(api.env.disable_user_cache)
+        api.env.invalidate_user_cache()
+        api.env.enable_user_cache()
+
+        with mock.patch.object(
+            acl_users,
+            'getUser',
+            wraps=acl_users.getUser,
+        ) as getUser:
+            api.env.adopt_user(username='worker')
+            api.env.adopt_user(username='boss')
+            api.env.invalidate_user_cache(username='worker')
+            api.env.adopt_user(username='worker')
+            api.env.adopt_user(username='boss')
+            self.assertEqual(getUser.call_count, 3)
+
+            api.env.invalidate_user_cache(user=api.user.get(username='boss'))
+            api.env.adopt_user(username='worker')
+            api.env.adopt_user(username='boss')
+            self.assertEqual(getUser.call_count, 4)
+
+            api.env.invalidate_user_cache()
+            api.env.adopt_user(username='worker')
+            api.env.adopt_user(username='boss')
+            self.assertEqual(getUser.call_count, 6)
+
+    def test_user_cache_group_membership(self):
+        """Test that group membership changes drop only that user."""
+        from plone.api.env import _get_user_cache
+        api.group.create(groupname='staff')
+        self.addCleanup(api.env.disable_user_cache)
+        api.env.enable_user_cache()
+
+        api.env.adopt_user(username='worker')
+        api.env.adopt_user(username='boss')
+        api.group.add_user(groupname='staff', username='worker')
+        self.assertEqual(list(_get_user_cache()), [('username', 'boss')])
+
+        api.env.adopt_user(username='worker')
+        api.group.remove_user(groupname='staff', username='worker')
+        self.assertEqual(list(_get_user_cache()), [('username', 'boss')])
+
+    def test_adopt_user_restores_on_exception(self):
+        """Test that the user is switched back when the block raises."""
+        with self.assertRaises(ExampleException):
+            with api.env.adopt_user(username='worker'):
+                raise ExampleException
+        self.assertEqual(api.user.get_current().getId(), 'boss')
+
+    def test_adopt_roles_restores_on_exception(self):
+        """Test that the roles are dropped when the block raises."""
+        with self.assertRaises(ExampleException):
+            with api.env.adopt_roles(['Manager']):
+                raise ExampleException
+        self.should_forbid(['rr_method'])
+        self.assertEqual(
+            AccessControl.getSecurityManager()._context.stack,
+            [],
+        )
+
+    def test_adopt_user_reentrant(self):
+        """Test entering the same adopt_user object while it is active."""
+        as_worker = api.env.adopt_user(username='worker')
+        with as_worker:
+            with api.env.adopt_user(username='superhuman'):
+                with as_worker:
+                    self.assertEqual(
+                        api.user.get_current().getId(),
+                        'worker',
+                    )
+                self.assertEqual(
+                    api.user.get_current().getId(),
+                    'superhuman',
+                )
+            self.assertEqual(api.user.get_current().getId(), 'worker')
+        self.assertEqual(api.user.get_current().getId(), 'boss')
+
+    def test_adopt_roles_reentrant(self):
+        """Test entering the same adopt_roles object while it is active."""
+        as_manager = api.env.adopt_roles(['Manager'])
+        with as_manager:
+            with api.env.adopt_roles(['Member']):
+                with as_manager:
+                    self.should_allow(['rr_method'])
+                self.should_forbid(['rr_method'])
+            self.should_allow(['rr_method'])
+        self.should_forbid(['rr_method'])
+
+    def test_adopt_user_decorator(self):
+        """Test running a function as another user."""
+        @api.env.adopt_user(username='worker')
+        def current_user(fail=False):
+            """Return the id of the current user."""
+            if fail:
+                raise ExampleException
+            return api.user.get_current().getId()
+
+        self.assertEqual(current_user.__doc__, 'Return the id of the current user.')
+        self.assertEqual(current_user(), 'worker')
+        self.assertEqual(api.user.get_current().getId(), 'boss')
+        with self.assertRaises(ExampleException):
+            current_user(fail=True)
+        self.assertEqual(api.user.get_current().getId(), 'boss')
+
+    def test_adopt_roles_decorator(self):
+        """Test running a function with other roles."""
+        @api.env.adopt_roles(['Manager'])
+        def call(name, fail=False):
+            self.portal.hpm.restrictedTraverse(name)
+            if fail:
+                raise ExampleException
+
+        call('rr_method')
+        self.should_forbid(['rr_method'])
+        with self.assertRaises(ExampleException):
+            call('rr_method', fail=True)
+        self.should_forbid(['rr_method'])
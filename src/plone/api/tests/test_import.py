@@ -0,0 +1,56 @@
+"""Tests for importing plone.api."""
+
+from plone import api
+
+import os
+import subprocess
+import sys
+import unittest
+
+
+def _run(code):
+    """Run ``code`` in a fresh interpreter and return its output."""
+    return subprocess.run(
+        [sys.executable, '-c', code],
+        check=True,
+        stdout=subprocess.PIPE,
+        universal_newlines=True,
+        env=dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path)),
+    ).stdout.split()
+
+
+class TestPloneApiImport(unittest.TestCase):
+    """Test that plone.api imports its modules on first use."""
+
+    @unittest.skipIf(
+        sys.version_info < (3, 7),
+        'Python 3.6 does not support __getattr__ on modules',
+    )
+    def test_modules_are_imported_on_first_use(self):
+        self.assertEqual(
+            _run(
+                'import sys\n'
+                'import plone.api\n'
+                "print('plone.api.content' in sys.modules)\n"
+                'plone.api.content\n'
+                "print('plone.api.content' in sys.modules)\n"
+                "print('plone.api.user' in sys.modules)\n",
+            ),
+            ['False', 'True', 'False'],
+        )
+
+    def test_modules(self):
+        for name in api.__all__:
+            self.assertIs(
+                getattr(api, name),
+                sys.modules['plone.api.' + name],
+            )
+        self.assertIn('content', dir(api))
+        with self.assertRaises(AttributeError):
+            api.spam
+
+    def test_from_import(self):
+        from plone.api import content
+        from plone.api import portal
+        self.assertIs(content, api.content)
+        self.assertIs(portal, api.portal)
@@ -204,6 +204,64 @@ class TestPloneApiPortal(unittest.TestCase):
             getToolByName(self.portal, 'portal_membership'),
         )
 
+    def test_lookup_cache(self):
+        """Test that the portal and tools are cached once enabled."""
+        portal.enable_lookup_cache()
+        self.addCleanup(portal.disable_lookup_cache)
+
+        with mock.patch('plone.api.portal._get') as _get:
+            _get.return_value = self.portal
+            self.assertEqual(portal.get(), self.portal)
+            self.assertEqual(portal.get(), self.portal)
+            self.assertEqual(_get.call_count, 1)
+
+        catalog = portal.get_tool('portal_catalog')
+        with mock.patch('plone.api.portal.getToolByName') as getToolByName:
+            self.assertIs(portal.get_tool('portal_catalog'), catalog)
+            self.assertFalse(getToolByName.called)
+
+        portal.disable_lookup_cache()
+        with mock.patch('plone.api.portal._get') as _get:
+            _get.return_value = self.portal
+            portal.get()
+            portal.get()
+            self.assertEqual(_get.call_count, 2)
+
+    def test_lookup_cache_site_changed(self):
+        """Test that the lookup cache is dropped when the site changes."""
+        a_site = content.create(
+            container=self.portal,
+            type='Folder',
+            title='A Site',
+        )
+        a_site.setSiteManager(LocalSiteManager(a_site))
+
+        portal.enable_lookup_cache()
+        self.addCleanup(portal.disable_lookup_cache)
+        portal.get_tool('portal_catalog')
+
+        setSite(a_site)
+        self.addCleanup(setSite, self.portal)
+        with mock.patch('plone.api.portal.getToolByName') as getToolByName:
+            portal.get_tool('portal_catalog')
+            self.assertTrue(getToolByName.called)
+
+    def test_lookup_cache_transaction_ended(self):
+        """Test that the lookup cache only lives as long as the
+        transaction.
+        """
+        portal.enable_lookup_cache()
+        self.addCleanup(portal.disable_lookup_cache)
+        portal.get_tool('portal_catalog')
+
+        with mock.patch('plone.api.portal.transaction.get') as get:
+            get.return_value = object()
+            with mock.patch(
+                'plone.api.portal.getToolByName',
+            ) as getToolByName:
+                portal.get_tool('portal_catalog')
+                self.assertTrue(getToolByName.called)
+
     def test_send_email_constraints(self):
         """Test the constraints for sending an email."""
         from plone.api.exc import MissingParameterError
@@ -551,6 +609,63 @@ class TestPloneApiPortal(unittest.TestCase):
         self.assertTrue(exc_str.startswith('Cannot find a record with name'))
         self.assertTrue('Did you mean?:' in exc_str)
 
+    def test_get_invalid_registry_record_suggestion_index(self):
+        """Test that suggestions come from an index of the record names."""
+        from plone.api.exc import InvalidParameterError
+        registry = getUtility(IRegistry)
+        expected = [key for key in registry.records.keys() if 'mail' in key]
+        self.assertTrue(expected)
+
+        with mock.patch(
+            'plone.api.portal._SuggestionIndex',
+            side_effect=portal._SuggestionIndex,
+        ) as index:
+            for attempt in range(2):
+                with self.assertRaises(InvalidParameterError) as cm:
+                    portal.get_registry_record(name='mail')
+                self.assertEqual(
+                    str(cm.exception).split('\n')[2:],
+                    expected,
+                )
+            # The index is built once
+            self.assertLessEqual(index.call_count, 1)
+
+            # and rebuilt when records are added
+            registry.records['plone.api.mail_power'] = Record(
+                field.TextLine(title='Mail power'),
+            )
+            with self.assertRaises(InvalidParameterError) as cm:
+                portal.get_registry_record(name='mail_power')
+            self.assertIn('plone.api.mail_power', str(cm.exception))
+
+            del registry.records['plone.api.mail_power']
+            with self.assertRaises(InvalidParameterError) as cm:
+                portal.get_registry_record(name='mail_power')
+            self.assertNotIn('Did you mean', str(cm.exception))
+
+    def test_get_invalid_registry_record_without_suggestions(self):
+        """Test turning off suggestions for records that are not found."""
+        from plone.api.exc import InvalidParameterError
+        with mock.patch('plone.api.portal._suggest_records') as suggest:
+            with self.assertRaises(InvalidParameterError) as cm:
+                portal.get_registry_record(name='querystring', suggest=False)
+        self.assertFalse(suggest.called)
+        self.assertEqual(
+            str(cm.exception),
+            "Cannot find a record with name 'querystring'",
+        )
+
+    def test_suggestion_index(self):
+        """Test finding names that contain a string."""
+        names = ['plone.a', 'plone.ab', 'plone.ba', 'other.b', 'plone.']
+        index = portal._SuggestionIndex(names)
+        for string in ('plone.', 'a', 'b', 'ab', 'e.b', '.', 'x', 'plone.ab.'):
+            self.assertEqual(
+                index.find(string),
+                sorted(name for name in names if string in name),
+            )
+        self.assertEqual(index.find(''), [])
+
     def test_get_registry_record_from_interface(self):
         """Test that getting a record from an interface works."""
         registry = getUtility(IRegistry)
@@ -647,6 +762,157 @@ class TestPloneApiPortal(unittest.TestCase):
             2,
         )
 
+    def test_get_registry_records(self):
+        """Test getting many registry records at once."""
+        registry = getUtility(IRegistry)
+        registry.records['plone.api.norris_power'] = Record(
+            field.TextLine(title="Chuck Norris' Power"),
+        )
+        registry['plone.api.norris_power'] = 'infinite'
+
+        self.assertEqual(
+            portal.get_registry_records(
+                names=['plone.api.norris_power', 'plone.email_charset'],
+            ),
+            {
+                'plone.api.norris_power': 'infinite',
+                'plone.email_charset': 'utf-8',
+            },
+        )
+        self.assertEqual(
+            portal.get_registry_records(
+                names=['plone.api.norris_power', 'plone.api.missing'],
+                default=None,
+            ),
+            {'plone.api.norris_power': 'infinite', 'plone.api.missing': None},
+        )
+
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+        with self.assertRaises(InvalidParameterError) as cm:
+            portal.get_registry_records(names=['plone.api.missing'])
+        self.assertTrue(
+            str(cm.exception).startswith('Cannot find a record with name'),
+        )
+        with self.assertRaises(InvalidParameterError):
+            portal.get_registry_records(names='plone.api.norris_power')
+        with self.assertRaises(MissingParameterError):
+            portal.get_registry_records()
+
+    def test_get_registry_records_from_interface(self):
+        """Test getting the records of an interface."""
+        registry = getUtility(IRegistry)
+        registry.registerInterface(IMyRegistrySettings)
+        portal.set_registry_record(
+            'field_one',
+            'one',
+            interface=IMyRegistrySettings,
+        )
+
+        self.assertEqual(
+            portal.get_registry_records(interface=IMyRegistrySettings),
+            {'field_one': 'one', 'field_two': None},
+        )
+        self.assertEqual(
+            portal.get_registry_records(
+                names=['field_two'],
+                interface=IMyRegistrySettings,
+            ),
+            {'field_two': None},
+        )
+
+        from plone.api.exc import InvalidParameterError
+        with self.assertRaises(InvalidParameterError) as cm:
+            portal.get_registry_records(
+                names=['field_one', 'field_three'],
+                interface=IMyRegistrySettings,
+            )
+        self.assertIn(' on interface ', str(cm.exception))
+        self.assertEqual(
+            portal.get_registry_records(
+                names=['field_three'],
+                interface=IMyRegistrySettings,
+                default=3,
+            ),
+            {'field_three': 3},
+        )
+        with self.assertRaises(InvalidParameterError):
+            portal.get_registry_records(interface=ImNotAnInterface)
+
+    def test_registry_lookup_cache(self):
+        """Test caching registry values until they change."""
+        registry = getUtility(IRegistry)
+        registry.records['plone.api.norris_power'] = Record(
+            field.TextLine(title="Chuck Norris' Power"),
+        )
+        registry['plone.api.norris_power'] = 'infinite'
+        portal.enable_lookup_cache()
+        self.addCleanup(portal.disable_lookup_cache)
+
+        with mock.patch.object(
+            type(registry),
+            'get',
+            autospec=True,
+            side_effect=type(registry).get,
+        ) as get:
+            for index in range(3):
+                self.assertEqual(
+                    portal.get_registry_record('plone.api.norris_power'),
+                    'infinite',
+                )
+                portal.get_registry_records(
+                    names=['plone.api.norris_power', 'plone.email_charset'],
+                )
+            self.assertEqual(get.call_count, 2)
+
+            portal.set_registry_record('plone.api.norris_power', 'finite')
+            self.assertEqual(
+                portal.get_registry_record('plone.api.norris_power'),
+                'finite',
+            )
+            registry['plone.api.norris_power'] = 'infinite again'
+            self.assertEqual(
+                portal.get_registry_record('plone.api.norris_power'),
+                'infinite again',
+            )
+
+    def test_registry_lookup_cache_without_subscriber(self):
+        """Test that set_registry_record drops the cached values itself."""
+        from plone.api.portal import _invalidate_registry_cache
+        from plone.registry.interfaces import IRecordEvent
+        from zope.component import getGlobalSiteManager
+
+        gsm = getGlobalSiteManager()
+        self.assertTrue(
+            gsm.unregisterHandler(
+                _invalidate_registry_cache,
+                required=(IRecordEvent, ),
+            ),
+        )
+        self.addCleanup(
+            gsm.registerHandler,
+            _invalidate_registry_cache,
+            required=(IRecordEvent, ),
+        )
+
+        registry = getUtility(IRegistry)
+        registry.records['plone.api.norris_power'] = Record(
+            field.TextLine(title="Chuck Norris' Power"),
+        )
+        registry['plone.api.norris_power'] = 'infinite'
+        portal.enable_lookup_cache()
+        self.addCleanup(portal.disable_lookup_cache)
+
+        self.assertEqual(
+            portal.get_registry_record('plone.api.norris_power'),
+            'infinite',
+        )
+        portal.set_registry_record('plone.api.norris_power', 'finite')
+        self.assertEqual(
+            portal.get_registry_record('plone.api.norris_power'),
+            'finite',
+        )
+
     def test_set_valid_registry_record(self):
         """Test that setting a valid registry record succeeds."""
         registry = getUtility(IRegistry)
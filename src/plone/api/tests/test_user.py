@@ -238,6 +238,116 @@ class TestPloneApiUser(unittest.TestCase):
         with self.assertRaises(GroupNotFoundError):
             api.user.get_users(groupname='bacon')
 
+    def test_get_users_iter(self):
+        """Test iterating over all users."""
+        for username in ('chuck', 'bob', 'alice'):
+            api.user.create(
+                username=username,
+                email='{}@example.org'.format(username),
+                password='secret',
+            )
+
+        users = api.user.get_users_iter()
+        self.assertNotIsInstance(users, list)
+        self.assertEqual(
+            [user.getId() for user in users],
+            sorted(['alice', 'bob', 'chuck', TEST_USER_ID]),
+        )
+        self.assertCountEqual(
+            [user.getId() for user in api.user.get_users_iter()],
+            [user.getId() for user in api.user.get_users()],
+        )
+
+    def test_get_users_iter_paging(self):
+        """Test paging through users."""
+        for username in ('chuck', 'bob', 'alice'):
+            api.user.create(
+                username=username,
+                email='{}@example.org'.format(username),
+                password='secret',
+            )
+        userids = sorted(['alice', 'bob', 'chuck', TEST_USER_ID])
+
+        pages = [
+            [
+                user.getId()
+                for user in api.user.get_users_iter(start=start, batch_size=3)
+            ]
+            for start in (0, 3, 6)
+        ]
+        self.assertEqual(pages, [userids[:3], userids[3:], []])
+
+        # Skipped users are not looked up.
+        portal_membership = api.portal.get_tool('portal_membership')
+        with mock.patch.object(
+            portal_membership,
+            'getMemberById',
+            wraps=portal_membership.getMemberById,
+        ) as getMemberById:
+            users = list(api.user.get_users_iter(start=2, batch_size=1))
+        self.assertEqual([user.getId() for user in users], userids[2:3])
+        self.assertEqual(getMemberById.call_count, 1)
+
+        from plone.api.exc import InvalidParameterError
+        with self.assertRaises(InvalidParameterError):
+            api.user.get_users_iter(start=-1)
+        with self.assertRaises(InvalidParameterError):
+            api.user.get_users_iter(batch_size=0)
+
+    def test_get_users_iter_properties(self):
+        """Test iterating over users with certain properties."""
+        for username in ('chuck', 'bob', 'alice'):
+            api.user.create(
+                username=username,
+                email='{}@example.org'.format(username),
+                password='secret',
+                properties={
+                    'location': 'Texas' if username != 'bob' else 'Mars',
+                },
+            )
+
+        users = api.user.get_users_iter(properties={'location': 'Texas'})
+        self.assertEqual([user.getId() for user in users], ['alice', 'chuck'])
+        users = api.user.get_users_iter(
+            properties={'location': 'Texas'},
+            start=1,
+            batch_size=5,
+        )
+        self.assertEqual([user.getId() for user in users], ['chuck'])
+        users = api.user.get_users_iter(
+            properties={'location': 'Texas', 'email': 'bob@example.org'},
+        )
+        self.assertEqual(list(users), [])
+
+    def test_get_users_iter_group(self):
+        """Test iterating over the users of a group."""
+        for username in ('chuck', 'bob'):
+            api.user.create(
+                username=username,
+                email='{}@example.org'.format(username),
+                password='secret',
+            )
+        api.group.create(groupname='staff')
+        api.group.create(groupname='interns')
+        api.group.add_user(username='chuck', groupname='staff')
+        api.group.add_user(username='bob', groupname='staff')
+        api.portal.get_tool('portal_groups').addPrincipalToGroup(
+            'interns',
+            'staff',
+        )
+
+        users = api.user.get_users_iter(groupname='staff')
+        self.assertEqual([user.getId() for user in users], ['bob', 'chuck'])
+        users = api.user.get_users_iter(
+            group=api.group.get(groupname='staff'),
+            start=1,
+        )
+        self.assertEqual([user.getId() for user in users], ['chuck'])
+
+        from plone.api.exc import GroupNotFoundError
+        with self.assertRaises(GroupNotFoundError):
+            api.user.get_users_iter(groupname='bacon')
+
     def test_delete_no_username(self):
         """Test deleting of a member with email login."""
 
@@ -563,6 +673,151 @@ class TestPloneApiUser(unittest.TestCase):
                 ).get(k, None),
             )
 
+    def test_get_permissions_filter(self):
+        """Test get_permissions for a subset of permissions."""
+        api.user.create(
+            username='chuck',
+            email='chuck@norris.org',
+            password='secret',
+        )
+
+        self.assertEqual(
+            api.user.get_permissions(
+                username='chuck',
+                permissions=['View', 'Manage portal'],
+            ),
+            {'View': True, 'Manage portal': False},
+        )
+        self.assertEqual(api.user.get_permissions(permissions=[]), {})
+
+    def test_get_permissions_matches_check_permission(self):
+        """Test get_permissions agrees with the security manager."""
+        from AccessControl.SecurityManagement import getSecurityManager
+        from AccessControl.users import nobody
+
+        user = api.user.create(
+            username='chuck',
+            email='chuck@norris.org',
+            password='secret',
+        )
+        folder = api.content.create(
+            container=self.portal,
+            type='Folder',
+            id='folder_one',
+        )
+        document = api.content.create(
+            container=folder,
+            type='Document',
+            id='document_one',
+        )
+        api.user.grant_roles(user=user, obj=folder, roles=['Editor'])
+        folder.manage_permission('Add portal content', ['Owner'], acquire=True)
+        document.manage_permission('View', ['Reviewer'], acquire=False)
+        permissions = [record[0] for record in getPermissions()]
+
+        def expected(obj):
+            sm = getSecurityManager()
+            return {
+                permission: bool(sm.checkPermission(permission, obj))
+                for permission in permissions
+            }
+
+        for obj in (self.portal, folder, document):
+            for adopted in (user, nobody, None):
+                if adopted is None:
+                    result = api.user.get_permissions(obj=obj)
+                    self.assertEqual(result, expected(obj))
+                    continue
+                with api.env.adopt_user(user=adopted):
+                    self.assertEqual(
+                        api.user.get_permissions(obj=obj),
+                        expected(obj),
+                    )
+            with api.env.adopt_roles(['Reviewer']):
+                self.assertEqual(
+                    api.user.get_permissions(obj=obj),
+                    expected(obj),
+                )
+
+    def test_get_permission_matrix(self):
+        """Test get_permission_matrix agrees with has_permission."""
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+        from plone.api.exc import UserNotFoundError
+
+        for username in ('chuck', 'bob'):
+            api.user.create(
+                username=username,
+                email='{}@example.org'.format(username),
+                password='secret',
+            )
+        folder = api.content.create(
+            container=self.portal,
+            type='Folder',
+            id='folder_one',
+        )
+        document = api.content.create(
+            container=folder,
+            type='Document',
+            id='document_one',
+        )
+        api.user.grant_roles(username='chuck', obj=folder, roles=['Editor'])
+        document.manage_permission('View', ['Reviewer'], acquire=False)
+        objs = [self.portal, folder, document]
+        usernames = ['chuck', 'bob', TEST_USER_NAME]
+        permissions = ['View', 'Modify portal content', 'Manage portal']
+
+        matrix = api.user.get_permission_matrix(
+            usernames=usernames,
+            objs=objs,
+            permissions=permissions,
+        )
+        self.assertEqual(matrix.userids, ['chuck', 'bob', TEST_USER_ID])
+        expected = set()
+        for user_index, username in enumerate(usernames):
+            for obj_index, obj in enumerate(objs):
+                for permission in permissions:
+                    allowed = api.user.has_permission(
+                        permission,
+                        username=username,
+                        obj=obj,
+                    )
+                    self.assertEqual(
+                        matrix[user_index, obj_index, permission],
+                        allowed,
+                    )
+                    if allowed:
+                        expected.add((matrix.userids[user_index], obj, permission))
+        self.assertEqual(set(matrix.grants()), expected)
+        self.assertTrue(matrix[0, 1, 1])
+        self.assertFalse(matrix[1, 1, 1])
+
+        users = [api.user.get(username=username) for username in usernames]
+        by_user = api.user.get_permission_matrix(
+            users=users,
+            objs=objs,
+            permissions=permissions,
+        )
+        self.assertEqual(set(by_user.grants()), expected)
+
+        with self.assertRaises(IndexError):
+            matrix[3, 0, 0]
+        with self.assertRaises(UserNotFoundError):
+            api.user.get_permission_matrix(
+                usernames=['ming'],
+                objs=objs,
+                permissions=permissions,
+            )
+        with self.assertRaises(InvalidParameterError):
+            api.user.get_permission_matrix(
+                usernames=usernames,
+                users=users,
+                objs=objs,
+                permissions=permissions,
+            )
+        with self.assertRaises(MissingParameterError):
+            api.user.get_permission_matrix(objs=objs, permissions=permissions)
+
     def test_has_permission_context(self):
         """Test has_permission on some context."""
 
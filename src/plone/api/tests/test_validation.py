@@ -6,6 +6,7 @@ from plone.api.validation import at_least_one_of
 from plone.api.validation import mutually_exclusive_parameters
 from plone.api.validation import required_parameters
 
+import inspect
 import unittest
 
 
@@ -263,3 +264,69 @@ class TestPloneAPIValidation(unittest.TestCase):
         # everything ok
         self.assertEqual(_func1_decorated('ahoy'), 'foo')
         self.assertEqual(_func1_decorated('ahoy', arg3='there'), 'foo')
+
+    def test_stacked_validators_are_fused(self):
+        """Test that stacking validators produces a single wrapper around
+        the undecorated function, with the original signature.
+        """
+        def _func(arg1=None, arg2=None, arg3=None, **kwargs):
+            """This is my docstring"""
+            return 'foo'
+
+        _func_decorated = mutually_exclusive_parameters('arg1', 'arg2')(
+            at_least_one_of('arg1', 'arg2')(
+                required_parameters('arg3')(_func),
+            ),
+        )
+
+        self.assertIs(_func_decorated.__wrapped__, _func)
+        self.assertEqual(_func_decorated.__doc__, 'This is my docstring')
+        self.assertEqual(
+            inspect.getfullargspec(_func_decorated).args,
+            ['arg1', 'arg2', 'arg3'],
+        )
+        self.assertEqual(_func_decorated('ahoy', arg3='there'), 'foo')
+
+    def test_error_messages(self):
+        """Test the error messages of the fused validators."""
+        from plone.api.exc import InvalidParameterError
+        from plone.api.exc import MissingParameterError
+
+        @mutually_exclusive_parameters('arg1', 'arg2')
+        @at_least_one_of('arg1', 'arg2')
+        @required_parameters('arg3')
+        def _func(arg1=None, arg2=None, arg3=None, **kwargs):
+            return 'foo'
+
+        with self.assertRaises(InvalidParameterError) as cm:
+            _func('ahoy', 'there', extra='matey')
+        self.assertEqual(
+            str(cm.exception),
+            'These parameters are mutually exclusive: arg1, arg2, extra.',
+        )
+
+        with self.assertRaises(MissingParameterError) as cm:
+            _func(arg3='matey')
+        self.assertEqual(
+            str(cm.exception),
+            'At least one of these parameters must be supplied: arg1, arg2.',
+        )
+
+        with self.assertRaises(MissingParameterError) as cm:
+            _func(arg1='ahoy')
+        self.assertEqual(
+            str(cm.exception),
+            'Missing required parameter(s): arg3',
+        )
+
+    def test_required_positional_parameter(self):
+        """Test that parameters without a default keep being required by
+        the function signature itself.
+        """
+        @required_parameters('arg2')
+        def _func(arg1, arg2=None):
+            return arg1
+
+        self.assertEqual(_func('ahoy', 'there'), 'ahoy')
+        with self.assertRaises(TypeError):
+            _func(arg2='there')
@@ -1,8 +1,14 @@
 """Module that provides functionality for user manipulation."""
 
+from AccessControl.Permission import getPermissionIdentifier
 from AccessControl.Permission import getPermissions
+from AccessControl.PermissionRole import _what_not_even_god_should_do
 from AccessControl.SecurityManagement import getSecurityManager
+from Acquisition import aq_base
+from Acquisition import aq_inner
+from Acquisition import aq_parent
 from contextlib import contextmanager
+from plone.api import content
 from plone.api import env
 from plone.api import portal
 from plone.api.exc import GroupNotFoundError
@@ -14,7 +20,9 @@ from plone.api.validation import mutually_exclusive_parameters
 from plone.api.validation import required_parameters
 from Products.CMFPlone.RegistrationTool import get_member_by_login_name
 from Products.PlonePAS.interfaces.plugins import ILocalRolesPlugin
+from Products.PluggableAuthService.interfaces.plugins import IUserEnumerationPlugin
 
+import itertools
 import random
 import string
 
@@ -164,6 +172,91 @@ def get_users(groupname=None, group=None):
         return portal_membership.listMembers()
 
 
+@mutually_exclusive_parameters('groupname', 'group')
+def get_users_iter(
+    groupname=None,
+    group=None,
+    start=0,
+    batch_size=None,
+    properties=None,
+):
+    """Iterate over all users, or all users of a group, one at a time.
+
+    Unlike :meth:`get_users`, only the ids of the users are collected up
+    front, from the user enumeration plugins of ``acl_users`` or from the
+    members of the group. Each user is looked up when the iteration reaches
+    it. Users are sorted by id, so ``start`` and ``batch_size`` can be used
+    to page through them.
+
+    Arguments ``group`` and ``groupname`` are mutually exclusive.
+    You can either set one or the other, but not both.
+
+    :param groupname: Groupname of the group of which to return users. If set,
+        only return users that are member of this group.
+    :type groupname: string
+    :param group: Group of which to return users.
+        If set, only return users that are member of this group.
+    :type group: GroupData object
+    :param start: Number of (matching) users to skip.
+    :type start: int
+    :param batch_size: If set, stop after this many users.
+    :type batch_size: int
+    :param properties: If set, only return users whose properties have
+        these values.
+    :type properties: dict
+    :returns: Users (optionally filtered by group and properties)
+    :rtype: Iterator of MemberData objects
+    :raises:
+        InvalidParameterError
+        GroupNotFoundError
+    :Example: :ref:`user-get-users-iter-example`
+    """
+    if start < 0:
+        raise InvalidParameterError('start has to be a non-negative integer')
+    if batch_size is not None and batch_size < 1:
+        raise InvalidParameterError('batch_size has to be a positive integer')
+
+    if groupname or group:
+        group_tool = portal.get_tool('portal_groups')
+        if group is None:
+            group = group_tool.getGroupById(groupname)
+            if not group:
+                raise GroupNotFoundError
+        # Groups can be members of groups, too.
+        userids = set(group_tool.getGroupMembers(group.getId()))
+        userids.difference_update(group_tool.getGroupIds())
+    else:
+        acl_users = portal.get_tool('acl_users')
+        userids = set()
+        plugins = acl_users.plugins.listPlugins(IUserEnumerationPlugin)
+        for plugin_id, plugin in plugins:
+            userids.update(info['id'] for info in plugin.enumerateUsers())
+
+    userids = sorted(userids)
+    if not properties:
+        # Every id belongs to a user, so the skipped users need not be
+        # looked up.
+        userids = userids[start:]
+        start = 0
+    stop = None if batch_size is None else start + batch_size
+    return itertools.islice(_iter_users(userids, properties), start, stop)
+
+
+def _iter_users(userids, properties):
+    """Look up the users with ``userids`` that have ``properties``."""
+    portal_membership = portal.get_tool('portal_membership')
+    for userid in userids:
+        user = portal_membership.getMemberById(userid)
+        if user is None:
+            continue
+        if properties and any(
+            user.getProperty(name, None) != value
+            for name, value in properties.items()
+        ):
+            continue
+        yield user
+
+
 @mutually_exclusive_parameters('username', 'user')
 @at_least_one_of('username', 'user')
 def delete(username=None, user=None):
@@ -260,8 +353,123 @@ def _nop_context_manager():
     yield
 
 
+# The roles of a permission that is not set anywhere in the acquisition
+# chain, as in AccessControl.PermissionRole.
+_DEFAULT_ROLES = ('Manager', )
+
+# How the roles found by _resolve_roles combine with the roles acquired by
+# the objects below: they replace them, they are added to them and the walk
+# stops, or they are added to them and the walk went on to the top.
+_OVERRIDE = 0
+_FINAL = 1
+_ACQUIRED = 2
+
+_marker = object()
+
+
+def _resolve_roles(chain, index, name, cache):
+    """Resolve the permission attribute ``name`` from ``chain[index]`` up.
+
+    Returns the kind of the result and its roles, see ``_OVERRIDE`` and
+    friends. The result only depends on the object and the attribute name,
+    so it is stored in ``cache`` and shared by all objects below it.
+    """
+    if index == len(chain):
+        return _ACQUIRED, None
+
+    item = chain[index]
+    key = (id(aq_base(item)), name)
+    cached = cache.get(key)
+    if cached is not None:
+        # The object itself is stored as well, to keep its id in use.
+        return cached[1:]
+
+    roles = getattr(item, name, _marker)
+    if roles is None:
+        result = _OVERRIDE, ('Anonymous', )
+    elif type(roles) is tuple:
+        # A tuple means the roles are not acquired.
+        result = _FINAL, roles
+    elif type(roles) is str:
+        if roles:
+            # The permission is mapped to another one.
+            result = _resolve_roles(chain, index + 1, roles, cache)
+        else:
+            # The permission is private.
+            result = _OVERRIDE, _what_not_even_god_should_do
+    elif roles is _marker or not roles:
+        result = _resolve_roles(chain, index + 1, name, cache)
+    else:
+        roles = list(roles)
+        kind, acquired = _resolve_roles(chain, index + 1, name, cache)
+        if kind == _OVERRIDE:
+            result = kind, acquired
+        elif acquired:
+            result = kind, roles + list(acquired)
+        else:
+            result = kind, roles
+
+    cache[key] = (item, ) + result
+    return result
+
+
+def _permission_roles(obj, permissions, cache=None):
+    """Return the roles that have each of ``permissions`` on ``obj``.
+
+    This gives the same result as calling
+    ``AccessControl.PermissionRole.rolesForPermissionOn`` once per
+    permission, but the acquisition chain of ``obj`` is only walked once.
+    Pass the same ``cache`` dict to share the walk between objects with
+    common parents.
+    """
+    if cache is None:
+        cache = {}
+
+    chain = []
+    while obj is not None:
+        chain.append(obj)
+        obj = aq_parent(aq_inner(obj))
+
+    result = {}
+    for permission in permissions:
+        name = getPermissionIdentifier(permission)
+        roles = _resolve_roles(chain, 0, name, cache)[1]
+        result[permission] = _DEFAULT_ROLES if roles is None else roles
+    return result
+
+
+def _check_permissions(obj, permissions):
+    """Check ``permissions`` on ``obj`` for the current security manager.
+
+    Roles are looked up for all permissions in one pass. Since many
+    permissions are granted to the same roles, the user is asked only once
+    per distinct set of roles whether those roles allow access on ``obj``.
+    """
+    sm = getSecurityManager()
+    if sm._context.stack:
+        # Proxy roles and executable owners are involved, leave it to the
+        # security policy.
+        return {
+            permission: bool(sm.checkPermission(permission, obj))
+            for permission in permissions
+        }
+
+    user = sm.getUser()
+    allowed = {}
+    result = {}
+    for permission, roles in _permission_roles(obj, permissions).items():
+        if roles is _what_not_even_god_should_do:
+            result[permission] = False
+            continue
+        key = frozenset(roles)
+        if key not in allowed:
+            allowed[key] = bool(user.allowed(obj, roles))
+        result[permission] = allowed[key]
+    return result
+
+
 @mutually_exclusive_parameters('username', 'user')
-def get_permissions(username=None, user=None, obj=None):
+def get_permissions(username=None, user=None, obj=None, permissions=None):
     """Get user's site-wide or local permissions.
 
     Arguments ``username`` and ``user`` are mutually exclusive. You
@@ -276,6 +484,12 @@ def get_permissions(username=None, user=None, obj=None):
     :param obj: If obj is set then check the permissions on this context.
         If obj is not given, the site root will be used.
     :type obj: content object
+    :param permissions: If set, only check these permissions instead of
+        all permissions known to Zope.
+    :type permissions: list of strings
+    :returns: Permission names mapped to True if the user has the
+        permission, False otherwise.
+    :rtype: dict
     :raises:
         InvalidParameterError
     :Example: :ref:`user-get-permissions-example`
@@ -283,16 +497,16 @@ def get_permissions(username=None, user=None, obj=None):
     if obj is None:
         obj = portal.get()
 
+    if permissions is None:
+        permissions = [record[0] for record in getPermissions()]
+
     if username is None and user is None:
         context = _nop_context_manager()
     else:
         context = env.adopt_user(username, user)
 
     with context:
-        sm = getSecurityManager()
-        pms = (record[0] for record in getPermissions())
-        result = {pm: bool(sm.checkPermission(pm, obj)) for pm in pms}
-    return result
+        return _check_permissions(obj, permissions)
 
 
 @mutually_exclusive_parameters('username', 'user')
@@ -330,6 +544,150 @@ def has_permission(permission, username=None, user=None, obj=None):
         return bool(getSecurityManager().checkPermission(permission, obj))
 
 
+class PermissionMatrix:
+    """Permissions of many users on many objects, stored as one bit each.
+
+    ``matrix[user, obj, permission]`` is True if the user has the permission
+    on the object. ``user`` and ``obj`` are indexes into ``userids`` and
+    ``objects``, ``permission`` is an index into ``permissions`` or the name
+    of a permission.
+    """
+
+    __slots__ = ('userids', 'objects', 'permissions', '_bits')
+
+    def __init__(self, userids, objects, permissions):
+        self.userids = userids
+        self.objects = objects
+        self.permissions = permissions
+        size = len(userids) * len(objects) * len(permissions)
+        self._bits = bytearray((size + 7) // 8)
+
+    def _index(self, user, obj, permission):
+        if isinstance(permission, str):
+            permission = self.permissions.index(permission)
+        for index, values in (
+            (user, self.userids),
+            (obj, self.objects),
+            (permission, self.permissions),
+        ):
+            if not 0 <= index < len(values):
+                raise IndexError('PermissionMatrix index out of range')
+        return (
+            (user * len(self.objects) + obj) * len(self.permissions)
+            + permission
+        )
+
+    def _set(self, index):
+        self._bits[index >> 3] |= 1 << (index & 7)
+
+    def __getitem__(self, key):
+        index = self._index(*key)
+        return bool(self._bits[index >> 3] & 1 << (index & 7))
+
+    def grants(self):
+        """Iterate over the granted permissions.
+
+        :returns: ``(userid, obj, permission)`` for every permission a user
+            has on an object.
+        :rtype: generator of tuples
+        """
+        permissions = len(self.permissions)
+        cells = len(self.objects) * permissions
+        for position, byte in enumerate(self._bits):
+            while byte:
+                bit = byte & -byte
+                index = position * 8 + bit.bit_length() - 1
+                byte ^= bit
+                yield (
+                    self.userids[index // cells],
+                    self.objects[index % cells // permissions],
+                    self.permissions[index % permissions],
+                )
+
+
+@required_parameters('objs', 'permissions')
+@mutually_exclusive_parameters('usernames', 'users')
+@at_least_one_of('usernames', 'users')
+def get_permission_matrix(
+    usernames=None,
+    users=None,
+    objs=None,
+    permissions=None,
+):
+    """Check permissions of many users on many objects at once.
+
+    Arguments ``usernames`` and ``users`` are mutually exclusive. You
+    can either set one or the other, but not both.
+
+    Every user is looked up once, and the roles of every permission are
+    looked up once per object, sharing the walk up the acquisition chain
+    between objects with common parents. Each user is then asked once per
+    object and distinct set of roles whether it is allowed. The checks are
+    done as by a security manager without proxy roles.
+
+    :param usernames: Usernames of the users to check.
+    :type usernames: list of strings
+    :param users: User objects to check.
+    :type users: list of MemberData objects
+    :param objs: [required] Objects on which to check the permissions.
+    :type objs: list of content objects
+    :param permissions: [required] Permissions to check.
+    :type permissions: list of strings
+    :returns: The permissions of the users on the objects.
+    :rtype: PermissionMatrix
+    :raises:
+        MissingParameterError
+        InvalidParameterError
+        UserNotFoundError
+    :Example: :ref:`user-get-permission-matrix-example`
+    """
+    if usernames is not None:
+        principals = [env._get_user(username=name) for name in usernames]
+    else:
+        principals = [env._get_user(user=user) for user in users]
+    objs = list(objs)
+    permissions = list(permissions)
+    matrix = PermissionMatrix(
+        [principal.getId() for principal in principals],
+        objs,
+        permissions,
+    )
+
+    # For each object the permissions everybody has, and the other
+    # permissions grouped by the roles that have them.
+    cache = {}
+    rows = []
+    for obj in objs:
+        roles_map = _permission_roles(obj, permissions, cache)
+        everybody = []
+        by_roles = {}
+        for index, permission in enumerate(permissions):
+            roles = roles_map[permission]
+            if roles is _what_not_even_god_should_do:
+                continue
+            if 'Anonymous' in roles:
+                everybody.append(index)
+                continue
+            key = frozenset(roles)
+            if key in by_roles:
+                by_roles[key][1].append(index)
+            else:
+                by_roles[key] = (roles, [index])
+        rows.append((obj, everybody, list(by_roles.values())))
+
+    size = len(permissions)
+    for user_index, principal in enumerate(principals):
+        for obj_index, (obj, everybody, by_roles) in enumerate(rows):
+            offset = (user_index * len(objs) + obj_index) * size
+            for index in everybody:
+                matrix._set(offset + index)
+            for roles, indexes in by_roles:
+                if principal.allowed(obj, roles):
+                    for index in indexes:
+                        matrix._set(offset + index)
+    return matrix
+
+
 @required_parameters('roles')
 @mutually_exclusive_parameters('username', 'user')
 def grant_roles(username=None, user=None, obj=None, roles=None):
@@ -375,8 +733,10 @@ def grant_roles(username=None, user=None, obj=None, roles=None):
 
     if obj is None:
         user.setSecurityProfile(roles=roles)
+        env.invalidate_user_cache(user=user)
     else:
         obj.manage_setLocalRoles(user.getId(), roles)
+        content._clear_path_cache()
 
 
 @required_parameters('roles')
@@ -427,7 +787,10 @@ def revoke_roles(username=None, user=None, obj=None, roles=None):
 
     if obj is None:
         user.setSecurityProfile(roles=roles)
-    elif not roles:
-        obj.manage_delLocalRoles([user.getId()])
+        env.invalidate_user_cache(user=user)
     else:
-        obj.manage_setLocalRoles(user.getId(), roles)
+        if roles:
+            obj.manage_setLocalRoles(user.getId(), roles)
+        else:
+            obj.manage_delLocalRoles([user.getId()])
+        content._clear_path_cache()